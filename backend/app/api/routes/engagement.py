@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
-import json
 
-from app.infrastructure.db import get_db
-from app.infrastructure.redis_client import get_json, set_json
+from app.infrastructure.db import get_async_db
+from app.infrastructure.tiered_cache import tiered_cache
 from app.models.sql_engagement import EngagementPost
 from app.domain.models.engagement_view import (
     EngagementFeedResponse, 
@@ -17,11 +18,11 @@ from app.domain.models.engagement_view import (
 router = APIRouter(prefix="/api/v1/engagement", tags=["Engagement"])
 
 @router.get("/feed", response_model=EngagementFeedResponse)
-def get_engagement_feed(
+async def get_engagement_feed(
     source: Optional[str] = Query(None, description="Filter by 'twitter' or 'youtube'"),
     limit: int = Query(20, le=50, description="Items per page"),
     cursor: Optional[str] = Query(None, description="Timestamp cursor for pagination"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Returns a unified feed of Tweets and YouTube videos.
@@ -32,31 +33,34 @@ def get_engagement_feed(
     #Redis Cache Check (Only for fresh feed i.e., no cursor)
     cache_key = f"engagement:feed:{source or 'all'}:{limit}"
     if not cursor:
-        cached_data = get_json(cache_key)
-        if cached_data:
-            return cached_data
+        # Passed through as stored: no json.loads, no response_model re-validation
+        cached_body = await tiered_cache.get_raw(cache_key, tags=["feed"])
+        if cached_body:
+            return Response(content=cached_body, media_type="application/json")
 
     #Build Database Query
-    query = db.query(EngagementPost)
+    query = select(EngagementPost)
     
     #Filter by source if requested
     if source:
-        query = query.filter(EngagementPost.source == source)
+        query = query.where(EngagementPost.source == source)
     
     #Cursor Pagination logic (fetch items older than cursor)
     if cursor:
         try:
             #Parse ISO string back to datetime
             cursor_dt = datetime.fromisoformat(cursor)
-            query = query.filter(EngagementPost.published_at < cursor_dt)
+            query = query.where(EngagementPost.published_at < cursor_dt)
         except ValueError:
             pass #Ignore invalid cursor
 
     #Sort & Limit
     #Fetch 1 extra item to check if next page exists
-    posts = query.order_by(EngagementPost.published_at.desc())\
-                 .limit(limit + 1)\
-                 .all()
+    result = await db.execute(
+        query.order_by(EngagementPost.published_at.desc())
+             .limit(limit + 1)
+    )
+    posts = result.scalars().all()
 
     # Process Pagination
     has_next = len(posts) > limit
@@ -96,8 +100,10 @@ def get_engagement_feed(
         pagination=PaginationInfo(next_cursor=next_cursor)
     )
 
-    #Save Fresh Feed to Redis (TTL 5 mins)
+    #Save Fresh Feed to Redis (TTL 5 mins), serialized once for this response and every cache hit
     if not cursor and response_items:
-        set_json(cache_key, response_data.model_dump(mode='json'), ttl=300)
+        body = response_data.model_dump_json()
+        await tiered_cache.set_raw(cache_key, body, ttl=300, tags=["feed"])
+        return Response(content=body, media_type="application/json")
 
     return response_data
\ No newline at end of file
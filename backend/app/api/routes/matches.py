@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse, JSONResponse, Response
+from sqlalchemy import select
+from typing import List, Optional
 from datetime import datetime, timedelta
 from dateutil import parser # Ensure python-dateutil is installed
 
@@ -10,21 +11,41 @@ from app.models.sql_match import Match
 
 from app.infrastructure.external_api import sportmonks_api
 from app.infrastructure.social_api import social_api
-from app.infrastructure.redis_client import set_json, get_json, redis_client
-from app.infrastructure.db import get_db
+from app.infrastructure.async_redis_client import mget_json, read_events, async_redis_client
+from app.infrastructure.tiered_cache import tiered_cache, set_swr
+from app.infrastructure.db import AsyncSessionLocal
+from app.infrastructure.upstream_guard import Priority
+from app.infrastructure.swr_cache import SWRCache
+from app.infrastructure.single_flight import SingleFlight
 
-from app.services.score_service import get_live_scores_view
-from app.services.polling_service import get_raw_live_matches, get_raw_live_match
+from app.services.score_service import LIVESCORE_BOARD_KEY, LIVESCORE_BOARD_ETAG_KEY, rebuild_live_scores_board
+from app.services.live_stream_service import live_stream_hub, format_sse, stream_id_key
+from redis.exceptions import ResponseError
+from app.core.config import settings
+from app.services.polling_service import get_raw_live_match
 from app.services.normalizers.match_normalizer import normalize_live_match
 from app.services.normalizers.detail_normalizer import normalize_match_detail
+from app.services.diff_service import snapshot_delta
+from app.services.live_snapshot_service import LIVE_VERSION_KEY, LIVE_DOCUMENT_KEY, LIVE_DOCUMENT_ETAG_KEY, polled_at_key
+from app.core.http_cache import etag_matches
+from app.core import serialization
 
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger("uvicorn.error")
 
 router = APIRouter(prefix="/api/v1/matches")
 
-async def fetch_and_store_highlights(match_id: int, team1: str, team2: str, match_start_str: str, db: Session):
+match_detail_cache = SWRCache("match_detail")
+livescore_board_flight = SingleFlight("livescore_board")
+live_match_flight = SingleFlight("live_match")
+
+# Strong references to in-flight highlight searches
+_highlight_tasks: set[asyncio.Task] = set()
+
+async def fetch_and_store_highlights(match_id: int, team1: str, team2: str, match_start_str: str):
     query = f"{team1} vs {team2} highlights"
     logger.info(f"SEARCHING YOUTUBE: {query}")
     
@@ -65,11 +86,15 @@ async def fetch_and_store_highlights(match_id: int, team1: str, team2: str, matc
                     logger.warning(f"Date Mismatch: {title} (Diff: {diff} days)")
 
         if valid_url:
-            match_row = db.query(Match).filter(Match.id == match_id).first()
-            if match_row:
-                match_row.highlights_url = valid_url
-                db.commit()
-                logger.info(f"SAVED TO DB: Match {match_id}")
+            # Runs after the request (or refresh) that scheduled it, so it opens its own session
+            async with AsyncSessionLocal() as db:
+                match_row = await db.get(Match, match_id)
+                if match_row:
+                    match_row.highlights_url = valid_url
+                    await db.commit()
+                    logger.info(f"SAVED TO DB: Match {match_id}")
+                    # Next read rebuilds the detail with the URL instead of waiting out the soft TTL
+                    await tiered_cache.invalidate(f"match:{match_row.match_id}")
         else:
             logger.error(f"No valid highlights found for {query}")
 
@@ -78,57 +103,221 @@ async def fetch_and_store_highlights(match_id: int, team1: str, team2: str, matc
 # Raw routes
 @router.get("/live/raw")
 async def raw_live_matches():
-    return await get_raw_live_matches()
+    return await sportmonks_api.fetch_live_matches_raw(priority=Priority.BACKGROUND)
 
 @router.get("/debug/fixtures-raw")
 async def debug_fixtures():
-    raw_data = await sportmonks_api.fetch_fixtures_raw()
+    raw_data = await sportmonks_api.fetch_fixtures_raw(priority=Priority.BACKGROUND)
     return raw_data
 
 @router.get("/{match_id}/raw")
 async def debug_matches(match_id: str):
-    raw_data = await sportmonks_api.fetch_match_details_rich(match_id=match_id)
+    raw_data = await sportmonks_api.fetch_match_details_rich(match_id=match_id, priority=Priority.BACKGROUND)
     return raw_data
 
 # Static routes
 @router.get("/live")
-async def get_live_matches():
-    ids = redis_client.get("live:matches")
-    if not ids: 
-        return {"data": []}
-    result = []
-    for match_id in ids.split(","):
-        match = get_json(f"live:match:{match_id}")
-        if match: 
-            result.append(match)
-    return {"data": result}
+async def get_live_matches(
+    since_version: Optional[int] = Query(None, description="Last 'version' the client has"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    All live match snapshots, as the poller's pre-serialized document (ETag /
+    If-None-Match supported).
+    With since_version: 304 if nothing changed, otherwise only the matches that
+    changed since then plus the current 'match_ids' (to drop finished ones).
+    A since_version ahead of the server's (live:version restarted after a Redis
+    flush) gets the full document.
+    """
+    if since_version is not None:
+        version, ids = await async_redis_client.mget([LIVE_VERSION_KEY, "live:matches"])
+        version = int(version or 0)
+        if version == since_version:
+            return Response(status_code=304)
+        if version > since_version:
+            return await live_delta(version, ids, since_version)
+
+    document, etag = await async_redis_client.mget([LIVE_DOCUMENT_KEY, LIVE_DOCUMENT_ETAG_KEY])
+    if document is None:
+        return {"version": 0, "data": []}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=document, media_type="application/json", headers={"ETag": etag})
+
+async def live_delta(version: int, ids: Optional[str], since_version: int) -> dict:
+    match_ids = ids.split(",") if ids else []
+    matches = [m for m in await mget_json([f"live:match:{mid}" for mid in match_ids]) if m]
+    return {
+        "version": version,
+        "base_version": since_version,
+        "match_ids": match_ids,
+        "data": [m for m in matches if m.get("version", 0) > since_version]
+    }
 
 @router.get("/livescore", response_model=List[LiveScoreCard])
-def get_unified_livescores(db: Session = Depends(get_db)):
-    return get_live_scores_view(db)
+async def get_unified_livescores():
+    # Materialized by the poller and the schedule sync: one MGET, no SQL, no re-serialization
+    board, etag = await async_redis_client.mget([LIVESCORE_BOARD_KEY, LIVESCORE_BOARD_ETAG_KEY])
+    if board is None:
+        # Cold start (nothing built yet): build it once, concurrent requests share it
+        board = await livescore_board_flight.do(
+            LIVESCORE_BOARD_KEY,
+            loader=rebuild_live_scores_board,
+            read_cache=lambda: async_redis_client.get(LIVESCORE_BOARD_KEY)
+        )
+    # The stored ETag spares the cache middleware from hashing the board per request
+    headers = {"ETag": etag} if etag else None
+    return Response(content=board, media_type="application/json", headers=headers)
 
 # Dynamic routes
+def snapshot_headers(snapshot: dict, polled_at: Optional[str] = None) -> dict:
+    """
+    X-Snapshot-Age: seconds since the data was last confirmed upstream, i.e. the
+    poller's last fetch of the match (polled_at, epoch seconds). Unchanged
+    payloads never move last_updated, so that is only the fallback.
+    """
+    headers = {"X-Snapshot-Version": str(snapshot.get("version", 0))}
+    try:
+        if polled_at is not None:
+            age = time.time() - float(polled_at)
+        else:
+            age = (datetime.now() - datetime.fromisoformat(snapshot["last_updated"])).total_seconds()
+        headers["X-Snapshot-Age"] = str(max(0, int(age)))
+    except (KeyError, TypeError, ValueError):
+        pass
+    return headers
+
+async def load_untracked_live_match(match_id: int) -> dict:
+    """
+    Upstream fetch for a match the poller does not track, cached briefly so
+    repeated requests share it.
+    """
+    raw = await get_raw_live_match(match_id, priority=Priority.INTERACTIVE)
+    snapshot = normalize_live_match(raw).model_dump(mode="json")
+    await tiered_cache.set(
+        f"live:untracked:{match_id}", snapshot,
+        ttl=settings.LIVE_UNTRACKED_TTL, tags=[f"match:{match_id}"]
+    )
+    return snapshot
+
 @router.get("/{match_id}/live", response_model=LiveMatch)
-async def get_live_match(match_id: int):
-    raw = await get_raw_live_match(match_id)
-    return normalize_live_match(raw)
+async def get_live_match(
+    match_id: int,
+    since_version: Optional[int] = Query(None, description="Last 'version' the client has")
+):
+    """
+    Served from the poller's snapshot. Only matches the poller does not track
+    go upstream (rate limited, coalesced, cached for a few seconds).
+    With since_version: 304 if unchanged, a delta of changed fields if that
+    version is still in history, else (including a since_version ahead of
+    ours) the full snapshot.
+    """
+    tags = [f"match:{match_id}"]
+    current = await tiered_cache.get(f"live:match:{match_id}", tags=tags)
+    if current is None:
+        untracked_key = f"live:untracked:{match_id}"
+        snapshot = await tiered_cache.get(untracked_key, tags=tags)
+        if snapshot is None:
+            snapshot = await live_match_flight.do(
+                str(match_id),
+                loader=lambda: load_untracked_live_match(match_id),
+                read_cache=lambda: tiered_cache.get(untracked_key, tags=tags)
+            )
+        return JSONResponse(snapshot, headers=snapshot_headers(snapshot))
 
-@router.get("/{match_id}")
-async def get_match_detail(
-    match_id: str, 
-    background_tasks: BackgroundTasks, 
-    db: Session = Depends(get_db)
+    headers = snapshot_headers(current, await async_redis_client.get(polled_at_key(match_id)))
+    if since_version is not None:
+        version = current.get("version", 0)
+        if version == since_version:
+            return Response(status_code=304, headers=headers)
+
+        # A since_version ahead of ours (versions restarted after a Redis flush) gets the full snapshot
+        history = await async_redis_client.lrange(f"live:history:{match_id}", 0, -1) if since_version < version else []
+        base = next((h for h in map(serialization.loads, history) if h.get("version") == since_version), None)
+        if base:
+            return JSONResponse({
+                "match_id": match_id,
+                "version": version,
+                "base_version": since_version,
+                "changes": snapshot_delta(base, current)
+            }, headers=headers)
+
+    return JSONResponse(current, headers=headers)
+
+@router.get("/{match_id}/events")
+async def get_match_events(
+    match_id: str,
+    after: Optional[str] = Query(None, description="Only return events after this event ID"),
+    limit: int = Query(100, le=500)
 ):
-    # Try Cache
-    cache_key = f"match:detail:{match_id}"
-    cached = get_json(cache_key)
-    
-    # CACHE BYPASS LOGIC
-    if cached:
-        # If we already have the URL, return it immediately.
-        if cached.get("highlights_url"):
-            return cached
-    
+    """
+    Match events oldest first, each with a stable 'id'.
+    Pass the last seen ID as 'after' to resume without re-fetching the match.
+    """
+    try:
+        events = await read_events(f"match:stream:{match_id}", after=after, count=limit)
+    except ResponseError:
+        raise HTTPException(status_code=400, detail="Invalid event ID")
+    return {"data": events, "last_id": events[-1]["id"] if events else after}
+
+@router.get("/{match_id}/stream")
+async def stream_live_match(
+    match_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """
+    Server-Sent Events stream for one match.
+    - 'snapshot': the full LiveMatch, sent on connect and after every change.
+    - 'event': MatchEvents (wickets, boundaries, over ends) as they are detected.
+    Reconnecting clients send Last-Event-ID and get the events they missed first.
+    """
+    async def event_source():
+        # Subscribe inside the generator so the finally below always unsubscribes
+        # (a client can disconnect before the body starts), and before replaying
+        # so nothing published in between is lost
+        queue = live_stream_hub.subscribe(match_id)
+        try:
+            replayed_up_to = None
+            if last_event_id:
+                try:
+                    missed = await read_events(
+                        f"match:stream:{match_id}", after=last_event_id,
+                        count=settings.MATCH_EVENT_STREAM_MAXLEN
+                    )
+                except ResponseError:
+                    missed = []
+                for event in missed:
+                    yield format_sse("event", event, event["id"])
+                if missed:
+                    replayed_up_to = stream_id_key(missed[-1]["id"])
+
+            current = await tiered_cache.get(f"live:match:{match_id}", tags=[f"match:{match_id}"])
+            if current:
+                yield format_sse("snapshot", current)
+            while True:
+                try:
+                    event_id, frame = await asyncio.wait_for(queue.get(), timeout=settings.STREAM_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                # Already sent during the replay
+                if event_id and replayed_up_to and stream_id_key(event_id) <= replayed_up_to:
+                    continue
+                yield frame
+        finally:
+            live_stream_hub.unsubscribe(match_id, queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def load_match_detail(match_id: str) -> dict:
+    """
+    Fetches, normalizes and caches one match detail document (SWR loader).
+    """
     # Fetch Fresh Data
     raw = await sportmonks_api.fetch_match_details_rich(match_id)
     
@@ -136,7 +325,9 @@ async def get_match_detail(
     normalized = normalize_match_detail(raw)
     
     # Enhance with DB Data
-    db_match = db.query(Match).filter(Match.match_id == match_id).first()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Match).where(Match.match_id == match_id))
+        db_match = result.scalars().first()
     
     if db_match:
         normalized.highlights_url = db_match.highlights_url
@@ -149,25 +340,43 @@ async def get_match_detail(
             start_str = data_part.get("starting_at")
             
             if t1_name and t2_name:
-                background_tasks.add_task(
-                    fetch_and_store_highlights, 
-                    db_match.id, 
-                    t1_name, 
-                    t2_name, 
-                    start_str, 
-                    db
+                # Loads can run after the response was sent (stale refresh), so
+                # this cannot go through the request's BackgroundTasks
+                task = asyncio.create_task(
+                    fetch_and_store_highlights(db_match.id, t1_name, t2_name, start_str)
                 )
+                _highlight_tasks.add(task)
+                task.add_done_callback(_highlight_tasks.discard)
             else:
                 logger.warning(f"Could not extract team names for match {match_id}")
 
     response_data = normalized.dict()
 
-    # Cache (Short TTL if missing URL to retry soon, Long if URL found)
+    # Soft TTL: short while live or still missing highlights, long otherwise.
+    # Past it the document is still served (and refreshed) until the hard TTL.
     is_live = raw.get("data", {}).get("live", False)
     ttl = 60 if is_live else 86400
     if normalized.status == "Finished" and not normalized.highlights_url:
         ttl = 300 
 
-    set_json(cache_key, response_data, ttl=ttl)
+    await set_swr(
+        f"match:detail:{match_id}", response_data,
+        soft_ttl=ttl, hard_ttl=ttl + settings.MATCH_DETAIL_STALE_TTL, tags=[f"match:{match_id}"]
+    )
+
+    return response_data
 
-    return response_data
\ No newline at end of file
+@router.get("/{match_id}")
+async def get_match_detail(match_id: str):
+    """
+    Fresh cache hits are returned as is; stale ones are returned immediately and
+    refreshed in the background. Only a cold miss waits for SportMonks (once
+    across all workers, see SingleFlight).
+    """
+    # Cached JSON text goes out as is: no parse, no response_model validation, no re-serialization
+    body = await match_detail_cache.get_raw(
+        f"match:detail:{match_id}",
+        loader=lambda: load_match_detail(match_id),
+        tags=[f"match:{match_id}"]
+    )
+    return Response(content=body, media_type="application/json")
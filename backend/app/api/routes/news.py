@@ -1,23 +1,34 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.infrastructure.db import get_db
+from app.infrastructure.db import get_async_db
+from app.infrastructure.tiered_cache import tiered_cache
 from app.models.sql_news import NewsArticle
 from app.domain.models.news import NewsArticleResponse
 
 router = APIRouter(prefix="/api/v1/news", tags=["news"])
 
 @router.get("", response_model=List[NewsArticleResponse])
-def get_latest_news(
+async def get_latest_news(
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get latest cricket news with auto-generated image URLs.
+    Cached until the next news fetch invalidates the 'news' tag (max 10 minutes).
     """
-    news = db.query(NewsArticle)\
-             .order_by(NewsArticle.published_at.desc())\
-             .limit(limit)\
-             .all()
-    return news
\ No newline at end of file
+    cache_key = f"news:latest:{limit}"
+    cached = await tiered_cache.get(cache_key, tags=["news"])
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(NewsArticle)
+        .order_by(NewsArticle.published_at.desc())
+        .limit(limit)
+    )
+    articles = [NewsArticleResponse.model_validate(a).model_dump(mode='json') for a in result.scalars().all()]
+    await tiered_cache.set(cache_key, articles, ttl=600, tags=["news"])
+    return articles
\ No newline at end of file
@@ -1,46 +1,48 @@
 import os
 from typing import Optional
 from datetime import date
-from sqlalchemy import cast, String
+from sqlalchemy import cast, String, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends, Query
-from app.infrastructure.db import get_db
+from app.infrastructure.db import get_db, get_async_db
 from app.models.sql_match import Match
 
 router = APIRouter(prefix="/api/v1/schedules", tags=["schedules"])
 
 @router.get("")
-def get_schedules(
-    db: Session = Depends(get_db),
+async def get_schedules(
+    db: AsyncSession = Depends(get_async_db),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     league_id: Optional[str] = None,
     team_id: Optional[str] = None,
     status: Optional[str] = None
 ):
-    query = db.query(Match)
+    query = select(Match)
 
     if date_from:
-        query = query.filter(Match.start_time >= date_from)
+        query = query.where(Match.start_time >= date_from)
     if date_to:
-        query = query.filter(Match.start_time <= date_to)
+        query = query.where(Match.start_time <= date_to)
 
     if status:
-        query = query.filter(Match.status == status)
+        query = query.where(Match.status == status)
 
     if league_id:
-        query = query.filter(
+        query = query.where(
             cast(Match.league['id'], String) == str(league_id)
         )
 
     if team_id:
         t_id = str(team_id)
-        query = query.filter(
+        query = query.where(
             (cast(Match.home_team['id'], String) == t_id) | 
             (cast(Match.away_team['id'], String) == t_id)
         )
 
-    return {"data": query.order_by(Match.start_time.asc()).limit(100).all()}
+    result = await db.execute(query.order_by(Match.start_time.asc()).limit(100))
+    return {"data": result.scalars().all()}
 
 from fastapi import Header, HTTPException
 from app.services.schedule_service import sync_schedules_to_db
@@ -0,0 +1,47 @@
+import gzip
+
+# Brotli needs the optional 'Brotli' package; without it only gzip is offered
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+# Server preference when the client accepts several
+SUPPORTED_ENCODINGS = ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Picks the preferred encoding the client accepts (q > 0), or None for identity.
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in SUPPORTED_ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    # mtime=0 keeps gzip output (and so the stored variant) deterministic
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Each content-coding is its own representation, so it gets its own strong
+    validator: '"<hash>"' -> '"<hash>-gzip"'.
+    """
+    return f'{etag[:-1]}-{encoding}"'
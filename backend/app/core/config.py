@@ -6,6 +6,9 @@ load_dotenv()
 class Settings:
     
     DATABASE_URL = os.getenv("DATABASE_URL","")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_STATEMENT_CACHE = os.getenv("DB_STATEMENT_CACHE", "true").lower() == "true"
     REDIS_URL = os.getenv("REDIS_URL","")
     EXTERNAL_API_KEY = os.getenv("EXTERNAL_API_KEY","")
     EXTERNAL_API_BASE_URL = os.getenv(
@@ -16,4 +19,84 @@ class Settings:
     TWITTER_HOST = os.getenv("TWITTER_HOST", "twitter241.p.rapidapi.com")
     YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
 
+    # Shared async Redis pool (per process)
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+
+    # Previous live snapshots kept per match for since_version deltas
+    LIVE_SNAPSHOT_HISTORY = int(os.getenv("LIVE_SNAPSHOT_HISTORY", "10"))
+
+    # Per-match event log (Redis Stream, approximately capped)
+    MATCH_EVENT_STREAM_MAXLEN = int(os.getenv("MATCH_EVENT_STREAM_MAXLEN", "500"))
+
+    # Live event stream (SSE)
+    STREAM_CLIENT_QUEUE_SIZE = int(os.getenv("STREAM_CLIENT_QUEUE_SIZE", "100"))
+    STREAM_HEARTBEAT_INTERVAL = float(os.getenv("STREAM_HEARTBEAT_INTERVAL", "15"))
+
+    # Set to false on API replicas when ingestion runs in 'python -m app.worker'
+    RUN_BACKGROUND_TASKS = os.getenv("RUN_BACKGROUND_TASKS", "true").lower() == "true"
+
+    # Only the lease holder runs the background pollers
+    LEADER_LEASE_TTL = float(os.getenv("LEADER_LEASE_TTL", "30"))
+
+    # How often a standalone worker pushes its metrics to Redis for the API's /metrics
+    WORKER_METRICS_INTERVAL = float(os.getenv("WORKER_METRICS_INTERVAL", "15"))
+
+    # Live poller fan-out
+    LIVE_POLL_CONCURRENCY = int(os.getenv("LIVE_POLL_CONCURRENCY", "5"))
+    LIVE_POLL_MATCH_TIMEOUT = float(os.getenv("LIVE_POLL_MATCH_TIMEOUT", "12"))
+
+    # Adaptive per-match poll intervals (seconds), picked from the match phase
+    LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", "30"))
+    LIVE_POLL_DEATH_INTERVAL = float(os.getenv("LIVE_POLL_DEATH_INTERVAL", "10"))
+    LIVE_POLL_BREAK_INTERVAL = float(os.getenv("LIVE_POLL_BREAK_INTERVAL", "120"))
+    LIVE_POLL_DELAYED_INTERVAL = float(os.getenv("LIVE_POLL_DELAYED_INTERVAL", "180"))
+    LIVE_POLL_FINISHED_INTERVAL = float(os.getenv("LIVE_POLL_FINISHED_INTERVAL", "600"))
+    LIVE_LIST_REFRESH_INTERVAL = float(os.getenv("LIVE_LIST_REFRESH_INTERVAL", "30"))
+    LIVE_POLL_MIN_SLEEP = float(os.getenv("LIVE_POLL_MIN_SLEEP", "2"))
+
+    # Shared upstream HTTP pools (one per host). Timeouts are per call, not per pool
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+    # Upstream quotas shared by all processes: (requests per hour, burst size).
+    # YouTube search costs 100 of the 10k daily units, hence ~4 calls/hour.
+    UPSTREAM_QUOTAS = {
+        "sportmonks": (int(os.getenv("SPORTMONKS_QUOTA_PER_HOUR", "3000")), int(os.getenv("SPORTMONKS_QUOTA_BURST", "100"))),
+        "cricbuzz": (int(os.getenv("CRICBUZZ_QUOTA_PER_HOUR", "100")), int(os.getenv("CRICBUZZ_QUOTA_BURST", "10"))),
+        "twitter": (int(os.getenv("TWITTER_QUOTA_PER_HOUR", "100")), int(os.getenv("TWITTER_QUOTA_BURST", "10"))),
+        "youtube": (int(os.getenv("YOUTUBE_QUOTA_PER_HOUR", "4")), int(os.getenv("YOUTUBE_QUOTA_BURST", "4"))),
+    }
+
+    # Circuit breaker: open after N consecutive upstream failures, retry after the timeout
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+    # Cache-miss coalescing: lock lifetime and how long other processes wait for the result.
+    # The lock outlives the slowest upstream call (15s); waiters never give up before it expires
+    SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "30"))
+    SINGLE_FLIGHT_WAIT = max(float(os.getenv("SINGLE_FLIGHT_WAIT", "30")), SINGLE_FLIGHT_LOCK_TTL)
+
+    # Stale-while-revalidate: how long past its soft TTL a match detail may
+    # still be served while a background refresh runs
+    MATCH_DETAIL_STALE_TTL = int(os.getenv("MATCH_DETAIL_STALE_TTL", "3600"))
+
+    # Seconds an upstream fetch of a match the poller does not track is reused
+    LIVE_UNTRACKED_TTL = int(os.getenv("LIVE_UNTRACKED_TTL", "15"))
+
+    # Materialized livescore board: rebuilt on change, and at least this often
+    # so matches roll in and out of its time window
+    LIVESCORE_BOARD_REFRESH_INTERVAL = float(os.getenv("LIVESCORE_BOARD_REFRESH_INTERVAL", "300"))
+    LIVESCORE_BOARD_TTL = int(os.getenv("LIVESCORE_BOARD_TTL", "86400"))
+
+    # Response compression: smallest body worth compressing, and how long the
+    # precompressed variants of a document are kept
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+    COMPRESSED_VARIANT_TTL = int(os.getenv("COMPRESSED_VARIANT_TTL", "3600"))
+    COMPRESSED_LOCAL_MAX_ENTRIES = int(os.getenv("COMPRESSED_LOCAL_MAX_ENTRIES", "200"))
+
+    # In-process cache tier in front of Redis (per worker)
+    CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1000"))
+    CACHE_LOCAL_TTL = float(os.getenv("CACHE_LOCAL_TTL", "5"))
+
 settings = Settings()
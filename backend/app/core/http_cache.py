@@ -0,0 +1,134 @@
+import hashlib
+import re
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import metrics
+from app.core.compression import negotiate_encoding, encoded_etag
+from app.core.config import settings
+from app.infrastructure.compressed_store import get_variant
+
+def make_etag(body: bytes | str) -> str:
+    """
+    Strong validator: quoted content hash of the exact response body.
+    """
+    if isinstance(body, str):
+        body = body.encode()
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    If-None-Match check (RFC 9110 weak comparison): '*', or any listed tag
+    equal to ours once a W/ prefix is ignored.
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    ours = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == ours for tag in if_none_match.split(","))
+
+# Cache-Control per read route (first match wins). max-age is for browsers,
+# s-maxage for the CDN; stale-while-revalidate lets the edge keep serving
+# while it refetches in the background.
+CACHE_POLICIES = [
+    (re.compile(r"^/api/v1/matches/live/?$"), "public, max-age=2, s-maxage=5, stale-while-revalidate=10"),
+    (re.compile(r"^/api/v1/matches/livescore/?$"), "public, max-age=5, s-maxage=10, stale-while-revalidate=30"),
+    (re.compile(r"^/api/v1/matches/[^/]+/live/?$"), "public, max-age=2, s-maxage=5, stale-while-revalidate=10"),
+    (re.compile(r"^/api/v1/schedules/?$"), "public, max-age=60, s-maxage=300, stale-while-revalidate=600"),
+    (re.compile(r"^/api/v1/news/?$"), "public, max-age=300, s-maxage=600, stale-while-revalidate=3600"),
+    (re.compile(r"^/api/v1/engagement/feed/?$"), "public, max-age=60, s-maxage=300, stale-while-revalidate=600"),
+    (re.compile(r"^/api/v1/matches/[^/]+/?$"), "public, max-age=30, s-maxage=60, stale-while-revalidate=300"),
+]
+
+def cache_policy(path: str) -> str | None:
+    return next((policy for pattern, policy in CACHE_POLICIES if pattern.match(path)), None)
+
+class HTTPCacheMiddleware:
+    """
+    Pure ASGI middleware for the read routes in CACHE_POLICIES:
+    - adds Cache-Control, and an ETag (hash of the body) unless the route set one
+    - answers If-None-Match with 304 and no body
+    - compresses with the client's preferred encoding, reusing the variant
+      stored for this ETag (see compressed_store)
+    Event streams, non-200 responses and other routes pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # HEAD bodies are empty, so their hash would not match GET's
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        policy = cache_policy(scope["path"])
+        if policy is None:
+            return await self.app(scope, receive, send)
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        accept_encoding = request_headers.get("accept-encoding")
+        start: Message = {}
+        chunks: list[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                headers = MutableHeaders(scope=message)
+                if message["status"] == 304:
+                    # Route-level 304 (e.g. since_version) still tells caches how long to keep it
+                    headers.setdefault("cache-control", policy)
+                if message["status"] != 200 or headers.get("content-type", "").startswith("text/event-stream"):
+                    passthrough = True
+                    await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._send_cached(start, b"".join(chunks), policy, if_none_match, accept_encoding, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_cached(
+        self, start: Message, body: bytes, policy: str,
+        if_none_match: str | None, accept_encoding: str | None, send: Send
+    ):
+        headers = MutableHeaders(scope=start)
+        if "content-encoding" in headers:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = headers.get("etag") or make_etag(body)
+        headers.setdefault("cache-control", policy)
+
+        encoding = None
+        if len(body) >= settings.COMPRESSION_MIN_SIZE:
+            headers.add_vary_header("Accept-Encoding")
+            encoding = negotiate_encoding(accept_encoding)
+        headers["etag"] = encoded_etag(etag, encoding) if encoding else etag
+
+        # Validators from any representation of this content count as a match
+        if etag_matches(if_none_match, etag) or etag_matches(if_none_match, headers["etag"]):
+            metrics.incr("http_cache.not_modified")
+            not_modified = MutableHeaders()
+            for name in ("etag", "cache-control", "vary"):
+                if name in headers:
+                    not_modified[name] = headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if encoding:
+            body = await get_variant(etag, encoding, body)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
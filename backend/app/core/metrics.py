@@ -0,0 +1,18 @@
+from collections import Counter
+from threading import Lock
+
+# Process-local counters exposed on /metrics.
+# Each worker reports its own numbers; aggregate them in the dashboard.
+_counters: Counter = Counter()
+_lock = Lock()
+
+def incr(name: str, amount: int = 1):
+    with _lock:
+        _counters[name] += amount
+
+def get(name: str) -> int:
+    return _counters.get(name, 0)
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(sorted(_counters.items()))
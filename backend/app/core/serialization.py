@@ -0,0 +1,24 @@
+import json
+
+# orjson is several times faster than the stdlib for both directions; the
+# stdlib stays as a fallback so a missing wheel never takes the API down
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+def dumps(value) -> bytes | str:
+    """
+    JSON-encodes a value for Redis or a raw response body. Unknown types
+    (e.g. Decimal) fall back to str(), like json.dumps(default=str).
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=str)
+
+def loads(data: bytes | str):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
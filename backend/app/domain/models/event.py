@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 from enum import Enum
 from datetime import datetime
 from typing import Optional
@@ -16,6 +16,16 @@ class MatchEvent(BaseModel):
     match_id: str | int
     event_type: EventType
     description: str
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=datetime.now)
     inning: int
-    over: float
\ No newline at end of file
+    over: float
+    ball_id: Optional[int] = None # SportMonks ball id, for ball-by-ball events
+
+    @computed_field
+    def event_id(self) -> str:
+        """
+        Deterministic identity: the same ball (or over, for score-diff events)
+        always yields the same ID, so re-polls and parallel pollers dedupe.
+        """
+        position = f"b{self.ball_id}" if self.ball_id is not None else f"{self.over:.1f}"
+        return f"{self.match_id}:{self.inning}:{position}:{self.event_type.value}"
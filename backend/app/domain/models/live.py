@@ -12,6 +12,7 @@ class InningScore(BaseModel):
 class LiveMatch(BaseModel):
     match_id: int
     status: str       # "Live", "2nd Innings", "Finished"
+    match_type: Optional[str] = None  # "T20", "ODI", "Test"
     note: str = ""    # e.g., "Target 115 runs" or "Stars won by..."
     
     #The crucial fix: Storing the list allows us to see 1st innings score
@@ -24,4 +25,7 @@ class LiveMatch(BaseModel):
     #Derived from the latest runs object
     current_batting_team_id: Optional[int] = None
     
-    last_updated: datetime
\ No newline at end of file
+    last_updated: datetime
+
+    #Bumped by the poller on every change; clients pass it back as since_version
+    version: int = 0
\ No newline at end of file
@@ -0,0 +1,77 @@
+import redis.asyncio as aioredis
+from app.core import serialization
+from typing import List
+from app.core.config import settings
+from app.infrastructure.redis_client import REDIS_URL
+
+# Async counterpart of redis_client for 'async def' routes and the pollers,
+# so no Redis round-trip blocks the event loop. One pool per process.
+redis_pool = aioredis.ConnectionPool.from_url(
+    REDIS_URL,
+    decode_responses=True,
+    max_connections=settings.REDIS_MAX_CONNECTIONS
+)
+
+async_redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+# Raw bytes (e.g. precompressed payloads), which the str client above cannot return
+binary_redis_pool = aioredis.ConnectionPool.from_url(
+    REDIS_URL,
+    decode_responses=False,
+    max_connections=settings.REDIS_MAX_CONNECTIONS
+)
+
+async_redis_binary_client = aioredis.Redis(connection_pool=binary_redis_pool)
+
+# Helpers accept an optional 'client' so callers can queue writes on a pipeline;
+# queuing a command is awaitable too, so the same helper works for both.
+
+async def set_json(key: str, value: dict, ttl: int = 60, client=None):
+    await (client or async_redis_client).set(key, serialization.dumps(value), ex=ttl)
+
+async def mget_json(keys: List[str]) -> List[dict | None]:
+    if not keys:
+        return []
+    return [serialization.loads(data) if data else None for data in await async_redis_client.mget(keys)]
+
+# Appends an event to a capped stream unless its event_id was already written.
+# Returns the new entry ID, or nil for a duplicate.
+APPEND_EVENT_ONCE_LUA = """
+if redis.call('SADD', KEYS[2], ARGV[1]) == 0 then
+    return false
+end
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+local entry_id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[3], '*', 'event', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return entry_id
+"""
+_append_event_once = async_redis_client.register_script(APPEND_EVENT_ONCE_LUA)
+
+async def append_event(key: str, event: dict, event_id: str, maxlen: int = 500, ttl: int = 86400, client=None):
+    """
+    Appends to a capped Redis Stream, deduplicated on event_id in '<key>:seen'.
+    The entry ID (returned, or part of the pipeline result) is an ordered
+    position clients can resume from; None means the event was a duplicate.
+    """
+    return await _append_event_once(
+        keys=[key, f"{key}:seen"],
+        args=[event_id, serialization.dumps(event), maxlen, ttl],
+        client=client or async_redis_client
+    )
+
+async def read_events(key: str, after: str | None = None, count: int = 100) -> List[dict]:
+    """
+    Stream entries strictly after 'after' (or from the start), oldest first.
+    """
+    start = f"({after}" if after else "-"
+    entries = await async_redis_client.xrange(key, min=start, max="+", count=count)
+    return [{**serialization.loads(fields["event"]), "id": entry_id} for entry_id, fields in entries]
+
+def pipeline(transaction: bool = True):
+    return async_redis_client.pipeline(transaction=transaction)
+
+async def close_redis():
+    await async_redis_client.aclose()
+    await redis_pool.disconnect()
+    await async_redis_binary_client.aclose()
+    await binary_redis_pool.disconnect()
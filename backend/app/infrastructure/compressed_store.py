@@ -0,0 +1,59 @@
+import logging
+from app.core import metrics
+from app.core.compression import SUPPORTED_ENCODINGS, compress
+from app.core.config import settings
+from app.infrastructure.async_redis_client import async_redis_binary_client
+from app.infrastructure.tiered_cache import LocalLRU
+
+logger = logging.getLogger(__name__)
+
+# Compressed variants are keyed by the ETag of the uncompressed body: the same
+# content always compresses to the same bytes, so entries never need invalidating.
+_local_variants = LocalLRU(settings.COMPRESSED_LOCAL_MAX_ENTRIES, settings.COMPRESSED_VARIANT_TTL)
+
+def variant_key(etag: str, encoding: str) -> str:
+    return f"compressed:{encoding}:{etag.removeprefix('W/').strip(chr(34))}"
+
+async def store_variants(etag: str, body: bytes | str, client=None):
+    """
+    Precompresses a document once per supported encoding when it is written
+    (poller / board rebuild), so no request ever has to compress it.
+    Pass a binary-client pipeline as 'client' to batch the writes.
+    """
+    if isinstance(body, str):
+        body = body.encode()
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return
+    target = client or async_redis_binary_client
+    for encoding in SUPPORTED_ENCODINGS:
+        data = compress(body, encoding)
+        await target.set(variant_key(etag, encoding), data, ex=settings.COMPRESSED_VARIANT_TTL)
+        _local_variants.set(variant_key(etag, encoding), data)
+
+async def get_variant(etag: str, encoding: str, body: bytes) -> bytes:
+    """
+    Compressed body for this ETag: local tier, then Redis, else compress once and store.
+    """
+    key = variant_key(etag, encoding)
+    data = _local_variants.get(key)
+    if data is not None:
+        metrics.incr("compression.local_hit")
+        return data
+
+    try:
+        data = await async_redis_binary_client.get(key)
+    except Exception as e:
+        logger.warning(f"Compressed variant lookup failed for {key}: {e}")
+        data = None
+
+    if data is None:
+        metrics.incr("compression.compressed")
+        data = compress(body, encoding)
+        try:
+            await async_redis_binary_client.set(key, data, ex=settings.COMPRESSED_VARIANT_TTL)
+        except Exception as e:
+            logger.warning(f"Could not store compressed variant {key}: {e}")
+    else:
+        metrics.incr("compression.redis_hit")
+    _local_variants.set(key, data)
+    return data
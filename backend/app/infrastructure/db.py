@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
@@ -12,4 +14,36 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def to_async_url(database_url: str):
+    """
+    Rewrites a sync Postgres URL (postgres://, postgresql+psycopg2://) for asyncpg.
+    asyncpg takes 'ssl' instead of libpq's 'sslmode'.
+    """
+    url = make_url(database_url)
+    if not url.drivername.startswith("postgres"):
+        return url
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+# Transaction-mode poolers (e.g. Supabase on port 6543) reject prepared statements
+_async_connect_args = {} if settings.DB_STATEMENT_CACHE else {
+    "statement_cache_size": 0,
+    "prepared_statement_cache_size": 0,
+}
+
+async_engine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args=_async_connect_args,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
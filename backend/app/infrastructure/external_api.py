@@ -1,13 +1,17 @@
-import httpx
+import logging
 from app.core.config import settings
+from app.infrastructure.http_client import get_http_client
+from app.infrastructure.upstream_guard import upstream_guard, Priority
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 class SportMonksAPI:
     def __init__(self):
         self.base_url = settings.EXTERNAL_API_BASE_URL.rstrip("/")
         self.api_token = settings.EXTERNAL_API_KEY
 
-    async def fetch_live_matches_raw(self) -> dict:
+    async def fetch_live_matches_raw(self, priority: Priority = Priority.LIVE) -> dict:
         """
         Calls SportMonks current live scores endpoint.
         Returns raw JSON from SportMonks API.
@@ -15,12 +19,13 @@ class SportMonksAPI:
         url = f"{self.base_url}/livescores"
         params = {"api_token": self.api_token, "include": "localteam,visitorteam"}
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
+        client = get_http_client("sportmonks")
+        async with upstream_guard.call("sportmonks", priority):
+            response = await client.get(url, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
+        return response.json()
 
-    async def fetch_todays_matches_raw(self) -> dict:
+    async def fetch_todays_matches_raw(self, priority: Priority = Priority.BACKGROUND) -> dict:
         """
         Calls SportMonks livescores endpoint for today's matches.
         Useful if you need schedule + live data.
@@ -29,23 +34,26 @@ class SportMonksAPI:
         params = {"api_token": self.api_token,
                    "include": "localteam,visitorteam,runs"}
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
+        client = get_http_client("sportmonks")
+        async with upstream_guard.call("sportmonks", priority):
+            response = await client.get(url, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
+        return response.json()
         
-    async def fetch_match_by_id_raw(self, match_id: str) -> dict:
+    async def fetch_match_by_id_raw(self, match_id: str, priority: Priority = Priority.LIVE) -> dict:
+        # 'balls' lets the live poller derive exact per-ball events
         url = f"{self.base_url}/fixtures/{match_id}"
         params = {
             "api_token": self.api_token,
-            "include": "localteam,visitorteam,runs,venue"
+            "include": "localteam,visitorteam,runs,venue,balls"
         }
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
+        client = get_http_client("sportmonks")
+        async with upstream_guard.call("sportmonks", priority):
+            response = await client.get(url, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
+        return response.json()
 
-    async def fetch_fixtures_raw(self) -> dict:
+    async def fetch_fixtures_raw(self, priority: Priority = Priority.BACKGROUND) -> dict:
             today = datetime.now().date()
             start_date = today - timedelta(days=30)
             end_date = today + timedelta(days=30)
@@ -60,12 +68,13 @@ class SportMonksAPI:
                 "filter[starts_between]": date_range,
             }
             
-            async with httpx.AsyncClient(timeout=15) as client:
-                response = await client.get(url, params=params)
+            client = get_http_client("sportmonks")
+            async with upstream_guard.call("sportmonks", priority):
+                response = await client.get(url, params=params, timeout=15)
                 response.raise_for_status()
-                return response.json()
+            return response.json()
     
-    async def fetch_match_details_rich(self, match_id: str) -> dict:
+    async def fetch_match_details_rich(self, match_id: str, priority: Priority = Priority.INTERACTIVE) -> dict:
         """
         Fetches FULL match details using the allowed includes for your plan.
         """
@@ -74,12 +83,13 @@ class SportMonksAPI:
             "api_token": self.api_token,
             "include": "localteam,visitorteam,venue,runs,batting,bowling,lineup,tosswon,firstumpire,secondumpire,tvumpire,referee,manofmatch",
         }
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, params=params)
+        client = get_http_client("sportmonks")
+        async with upstream_guard.call("sportmonks", priority):
+            response = await client.get(url, params=params, timeout=15)
             response.raise_for_status()
-            return response.json()
+        return response.json()
         
-    async def fetch_match_details_rich(self, match_id: str) -> dict:
+    async def fetch_match_details_rich(self, match_id: str, priority: Priority = Priority.INTERACTIVE) -> dict:
         """
         Updated to include balls and wickets for rich scorecard.
         """
@@ -89,10 +99,11 @@ class SportMonksAPI:
             "api_token": self.api_token,
             "include": "localteam,visitorteam,venue,runs,batting,bowling,lineup,tosswon,balls,scoreboards",
         }
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, params=params)
+        client = get_http_client("sportmonks")
+        async with upstream_guard.call("sportmonks", priority):
+            response = await client.get(url, params=params, timeout=15)
             response.raise_for_status()
-            return response.json()
+        return response.json()
 
 class NewsAPI:
     def __init__(self):
@@ -102,20 +113,21 @@ class NewsAPI:
             "x-rapidapi-host": self.host
         }
 
-    async def fetch_top_stories(self):
+    async def fetch_top_stories(self, priority: Priority = Priority.BACKGROUND):
         """
         Fetches the latest news list (Index).
         """
         url = f"https://{self.host}/news/v1/index"
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=self.headers)
+        try:
+            client = get_http_client("cricbuzz")
+            async with upstream_guard.call("cricbuzz", priority):
+                response = await client.get(url, headers=self.headers, timeout=30.0)
                 response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"News API fetch failed: {e}")
-                return {}
+            return response.json()
+        except Exception as e:
+            logger.error(f"News API fetch failed: {e}")
+            return {}
 
 sportmonks_api = SportMonksAPI()
 news_api = NewsAPI()
\ No newline at end of file
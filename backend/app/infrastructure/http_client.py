@@ -0,0 +1,75 @@
+import httpx
+import importlib.util
+import logging
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package; fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One long-lived pool per upstream host
+UPSTREAMS = ("sportmonks", "cricbuzz", "twitter", "youtube")
+
+_clients: dict[str, httpx.AsyncClient] = {}
+
+def _build_client(upstream: str) -> httpx.AsyncClient:
+    async def on_request(request: httpx.Request):
+        metrics.incr(f"http.{upstream}.requests")
+        # httpcore reports every new TCP connection through the trace hook,
+        # so requests - connections_opened = requests served on a reused connection
+        request.extensions["trace"] = on_trace
+
+    async def on_trace(event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            metrics.incr(f"http.{upstream}.connections_opened")
+
+    # No pool-wide timeout: every call passes its own (external_api: 10s for
+    # live/list calls, 15s for detail/schedule calls, 30s for news; social_api:
+    # 30s read, 10s connect)
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        event_hooks={"request": [on_request]},
+    )
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    """
+    Returns the shared client for an upstream.
+    Created lazily so scripts that never run the app startup hook still work.
+    """
+    client = _clients.get(upstream)
+    if client is None or client.is_closed:
+        client = _build_client(upstream)
+        _clients[upstream] = client
+    return client
+
+def start_http_clients():
+    for upstream in UPSTREAMS:
+        get_http_client(upstream)
+    logger.info(f"HTTP client pools ready (http2={HTTP2_AVAILABLE})")
+
+async def close_http_clients():
+    for upstream, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close HTTP client for {upstream}: {e}")
+    _clients.clear()
+
+def get_http_stats() -> dict:
+    stats = {}
+    for upstream in UPSTREAMS:
+        requests = metrics.get(f"http.{upstream}.requests")
+        opened = metrics.get(f"http.{upstream}.connections_opened")
+        stats[upstream] = {
+            "requests": requests,
+            "connections_opened": opened,
+            "connections_reused": max(requests - opened, 0),
+        }
+    return stats
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from app.core.config import settings
+from app.infrastructure.async_redis_client import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Extend / release the lease only if we still own it (atomic check-and-set)
+RENEW_LEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class LeaderElection:
+    """
+    Redis lease so only one process runs the background pollers.
+    The leader renews its lease every ttl/3; if it dies or loses Redis the
+    lease expires and another process takes over on its next heartbeat.
+    """
+
+    def __init__(self, key: str = "pollers:leader", ttl: float = settings.LEADER_LEASE_TTL):
+        self.key = key
+        self.ttl_ms = int(ttl * 1000)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._elected = asyncio.Event()
+        self._last_renewed = 0.0
+        self._renew = async_redis_client.register_script(RENEW_LEASE_LUA)
+        self._release = async_redis_client.register_script(RELEASE_LEASE_LUA)
+
+    @property
+    def is_leader(self) -> bool:
+        return self._elected.is_set()
+
+    async def heartbeat(self) -> bool:
+        """
+        Acquires the lease if free, renews it if held. Returns leadership state.
+        """
+        # The lease runs from when Redis applied the command, i.e. no earlier than now
+        attempted_at = time.monotonic()
+        try:
+            if self.is_leader:
+                held = await self._renew(keys=[self.key], args=[self.worker_id, self.ttl_ms])
+            else:
+                held = await async_redis_client.set(self.key, self.worker_id, nx=True, px=self.ttl_ms)
+        except Exception as e:
+            logger.warning(f"Leader heartbeat failed: {e}")
+            # Without Redis we cannot prove we still own the lease; step down once it would have
+            # expired. Only a confirmed renew/acquire moves that deadline.
+            held = self.is_leader and (time.monotonic() - self._last_renewed) * 1000 < self.ttl_ms
+        else:
+            if held:
+                self._last_renewed = attempted_at
+
+        if held:
+            if not self.is_leader:
+                logger.info(f"Leader election: {self.worker_id} acquired leadership")
+                self._elected.set()
+        elif self.is_leader:
+            logger.warning(f"Leader election: {self.worker_id} lost leadership")
+            self._elected.clear()
+        return self.is_leader
+
+    async def run(self):
+        while True:
+            await self.heartbeat()
+            await asyncio.sleep(self.ttl_ms / 3000)
+
+    async def wait_until_leader(self):
+        await self._elected.wait()
+
+    async def release(self):
+        if not self.is_leader:
+            return
+        self._elected.clear()
+        try:
+            await self._release(keys=[self.key], args=[self.worker_id])
+        except Exception as e:
+            logger.warning(f"Failed to release leader lease: {e}")
+
+leader_election = LeaderElection()
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+from app.core import metrics
+from app.core.config import settings
+from app.infrastructure.async_redis_client import async_redis_client
+from app.infrastructure.leader_election import RELEASE_LEASE_LUA
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Coalesces concurrent loads of the same key so only one caller hits the upstream.
+    - In-process: later callers await the first caller's future.
+    - Across processes: a Redis lock (SET NX PX) elects one loader; the others
+      return the stale value if they have one, or poll the cache until it is filled.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._release = async_redis_client.register_script(RELEASE_LEASE_LUA)
+
+    async def do(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        read_cache: Callable[[], Awaitable[Any]],
+        stale: Optional[Any] = None
+    ) -> Any:
+        """
+        loader() fetches and writes the cache; read_cache() returns the cached value or None.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            metrics.incr(f"single_flight.{self.namespace}.coalesced")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._load_once(key, loader, read_cache, stale)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unawaited future does not log
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _load_once(self, key, loader, read_cache, stale):
+        lock_key = f"lock:{self.namespace}:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+        waited = False
+        while True:
+            try:
+                acquired = await async_redis_client.set(
+                    lock_key, token, nx=True, px=int(settings.SINGLE_FLIGHT_LOCK_TTL * 1000)
+                )
+            except Exception as e:
+                # Without Redis we can only coalesce within this process
+                logger.warning(f"Single-flight lock for {lock_key} unavailable: {e}")
+                return await loader()
+
+            if acquired:
+                try:
+                    return await loader()
+                finally:
+                    try:
+                        await self._release(keys=[lock_key], args=[token])
+                    except Exception as e:
+                        logger.warning(f"Could not release {lock_key}: {e}")
+
+            # Another process is refreshing this key
+            if not waited:
+                metrics.incr(f"single_flight.{self.namespace}.coalesced")
+                waited = True
+            if stale is not None:
+                return stale
+
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                value = await read_cache()
+                if value is not None:
+                    return value
+                if not await async_redis_client.exists(lock_key):
+                    # The holder gave up (error/timeout) without filling the cache:
+                    # take the lock ourselves rather than every waiter loading at once
+                    break
+            else:
+                logger.warning(f"Gave up waiting for {lock_key}, loading without the lock")
+                return await loader()
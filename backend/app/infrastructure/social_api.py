@@ -3,6 +3,8 @@ import logging
 import urllib.parse
 from typing import Dict, Any
 from app.core.config import settings
+from app.infrastructure.http_client import get_http_client
+from app.infrastructure.upstream_guard import upstream_guard, Priority
 
 logger = logging.getLogger(__name__)
 
@@ -10,7 +12,7 @@ class SocialAPI:
     def __init__(self):
         self.timeout = httpx.Timeout(30.0, connect=10.0)
 
-    async def fetch_twitter_search(self, query: str, count: int = 20) -> Dict[str, Any]:
+    async def fetch_twitter_search(self, query: str, count: int = 20, priority: Priority = Priority.BACKGROUND) -> Dict[str, Any]:
         base_url = f"https://{settings.TWITTER_HOST}/search-v3"
         encoded_query = urllib.parse.quote(query)
         full_url = f"{base_url}?type=Latest&count={count}&query={encoded_query}"
@@ -20,15 +22,16 @@ class SocialAPI:
             "x-rapidapi-host": settings.TWITTER_HOST
         }
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(full_url, headers=headers)
+            client = get_http_client("twitter")
+            async with upstream_guard.call("twitter", priority):
+                response = await client.get(full_url, headers=headers, timeout=self.timeout)
                 response.raise_for_status()
-                return response.json()
+            return response.json()
         except Exception as e:
             logger.error(f"Twitter API fetch failed: {str(e)}")
             return {}
 
-    async def fetch_youtube_search(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+    async def fetch_youtube_search(self, query: str, max_results: int = 10, priority: Priority = Priority.BACKGROUND) -> Dict[str, Any]:
         url = "https://www.googleapis.com/youtube/v3/search"
         params = {
             "part": "snippet",
@@ -41,10 +44,11 @@ class SocialAPI:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
+            client = get_http_client("youtube")
+            async with upstream_guard.call("youtube", priority):
+                response = await client.get(url, params=params, timeout=self.timeout)
                 response.raise_for_status()
-                return response.json()
+            return response.json()
         except Exception as e:
             logger.error(f"YouTube API fetch failed: {str(e)}")
             return {}
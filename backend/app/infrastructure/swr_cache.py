@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Iterable
+from app.core import metrics, serialization
+from app.infrastructure.tiered_cache import get_swr_raw
+from app.infrastructure.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+class SWRCache:
+    """
+    Stale-while-revalidate reads on top of set_swr/get_swr_raw entries (tiered cache).
+    - fresh hit: returned as is
+    - stale hit: returned immediately, refreshed in a background task
+    - miss: loaded once (single-flight) while concurrent callers wait
+    Loaders fetch the value AND write it with set_swr, choosing their own TTLs.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.flight = SingleFlight(namespace)
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get_raw(self, key: str, loader: Callable[[], Awaitable[Any]], tags: Iterable[str] = ()) -> bytes | str:
+        """
+        Returns the value as JSON text: a hit is passed through without parsing.
+        """
+        data, stale = await get_swr_raw(key, tags)
+        if data is None:
+            return serialization.dumps(await self._load(key, loader))
+        self._on_hit(key, loader, data, stale)
+        return data
+
+    async def _load(self, key: str, loader):
+        metrics.incr(f"cache.{self.namespace}.miss")
+        return await self.flight.do(key, loader, read_cache=lambda: self._read_value(key))
+
+    def _on_hit(self, key: str, loader, cached, stale: bool):
+        if stale:
+            metrics.incr(f"cache.{self.namespace}.stale")
+            self._schedule_refresh(key, loader, cached)
+        else:
+            metrics.incr(f"cache.{self.namespace}.hit")
+
+    async def _read_value(self, key: str):
+        # The loader's contract is a value, so the flight's cache read returns one too
+        data, _ = await get_swr_raw(key)
+        return serialization.loads(data) if data is not None else None
+
+    def _schedule_refresh(self, key: str, loader, stale_value):
+        if key in self._refreshing:
+            return
+        # stale_value makes other processes skip the refresh if one is already running
+        task = asyncio.create_task(
+            self.flight.do(key, loader, read_cache=lambda: self._read_value(key), stale=stale_value)
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda t: self._refresh_done(key, t))
+
+    def _refresh_done(self, key: str, task: asyncio.Task):
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background refresh of {key} failed: {task.exception()}")
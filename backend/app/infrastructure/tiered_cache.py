@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Iterable
+from app.core import metrics, serialization
+from app.core.config import settings
+from app.infrastructure.async_redis_client import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Every process listens here and drops the local copies named in a message:
+# {"origin": ..., "tags": [...], "keys": [...]}
+CACHE_INVALIDATE_CHANNEL = "cache:invalidate"
+
+def tag_key(tag: str) -> str:
+    # Redis set of the cache keys carrying this tag
+    return f"cache:tag:{tag}"
+
+class LocalLRU:
+    """
+    In-process tier: bounded by entry count (LRU eviction) and a per-entry TTL.
+    Values are shared between callers; they must not be mutated.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any, frozenset]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = (), ttl: float | None = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value, frozenset(tags))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def drop_keys(self, keys: Iterable[str]):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def drop_tags(self, tags: Iterable[str]):
+        tags = set(tags)
+        for key in [k for k, (_, _, t) in self._entries.items() if t & tags]:
+            del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+class TieredCache:
+    """
+    Local LRU in front of Redis JSON values. Both tiers hold the JSON text, so
+    get_raw() hits can be sent to clients without a parse/serialize round trip.
+    - get()/get_raw(): local hit, else Redis (and fill the local tier)
+    - set(): writes Redis + the tag index, and tells other processes to drop their copy
+    - invalidate(tags): deletes every tagged key in Redis and every local copy everywhere
+    """
+
+    def __init__(self, max_entries: int = settings.CACHE_LOCAL_MAX_ENTRIES, local_ttl: float = settings.CACHE_LOCAL_TTL):
+        self.local = LocalLRU(max_entries, local_ttl)
+        self.origin = uuid.uuid4().hex
+        self._listener: asyncio.Task | None = None
+
+    async def get_raw(self, key: str, tags: Iterable[str] = ()) -> bytes | str | None:
+        """
+        The stored JSON text, for responses that pass it straight through.
+        """
+        self._ensure_listener()
+        data = self.local.get(key)
+        if data is not None:
+            metrics.incr("tiered_cache.local_hit")
+            return data
+
+        data = await async_redis_client.get(key)
+        if data is None:
+            metrics.incr("tiered_cache.miss")
+            return None
+        metrics.incr("tiered_cache.redis_hit")
+        self.local.set(key, data, tags)
+        return data
+
+    async def get(self, key: str, tags: Iterable[str] = ()) -> Any:
+        data = await self.get_raw(key, tags)
+        return serialization.loads(data) if data is not None else None
+
+    async def set_raw(self, key: str, data: bytes | str, ttl: int, tags: Iterable[str] = ()):
+        tags = list(tags)
+        pipe = async_redis_client.pipeline(transaction=False)
+        await pipe.set(key, data, ex=ttl)
+        for tag in tags:
+            await pipe.sadd(tag_key(tag), key)
+            # New index: give it this TTL; existing one: only ever extend it
+            await pipe.expire(tag_key(tag), ttl, nx=True)
+            await pipe.expire(tag_key(tag), ttl, gt=True)
+        await self.broadcast(keys=[key], client=pipe)
+        await pipe.execute()
+        self.local.set(key, data, tags, ttl)
+
+    async def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = ()):
+        await self.set_raw(key, serialization.dumps(value), ttl, tags)
+
+    async def invalidate(self, *tags: str):
+        keys = set()
+        for tag in tags:
+            keys.update(await async_redis_client.smembers(tag_key(tag)))
+        pipe = async_redis_client.pipeline(transaction=False)
+        if keys:
+            await pipe.delete(*keys)
+        await pipe.delete(*[tag_key(tag) for tag in tags])
+        await self.broadcast(tags=tags, client=pipe)
+        await pipe.execute()
+        self.local.drop_tags(tags)
+
+    async def broadcast(self, tags: Iterable[str] = (), keys: Iterable[str] = (), client=None):
+        """
+        Drops local copies in every process (Redis is left untouched), e.g. after
+        the poller overwrote a snapshot directly.
+        """
+        message = json.dumps({"origin": self.origin, "tags": list(tags), "keys": list(keys)})
+        await (client or async_redis_client).publish(CACHE_INVALIDATE_CHANNEL, message)
+
+    def apply(self, raw: str):
+        message = json.loads(raw)
+        if message.get("origin") == self.origin:
+            # Our own write/invalidation, already applied locally
+            return
+        self.local.drop_keys(message.get("keys", []))
+        self.local.drop_tags(message.get("tags", []))
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            pubsub = async_redis_client.pubsub()
+            try:
+                await pubsub.subscribe(CACHE_INVALIDATE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        self.apply(message["data"])
+                    except Exception as e:
+                        logger.warning(f"Dropping malformed cache invalidation: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed; local entries expire on their own TTL
+                logger.error(f"Cache invalidation subscription error, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def close(self):
+        if self._listener and not self._listener.done():
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        self._listener = None
+
+tiered_cache = TieredCache()
+
+# Stale-while-revalidate entries: the value plus the epoch time it goes stale.
+# The Redis TTL is the hard TTL; between the two the value is served while it refreshes.
+# Fixed layout '{"fresh_until":<ts>,"value":<json>}' so the value's JSON text can be
+# sliced out without parsing the whole entry.
+SWR_PREFIX = '{"fresh_until":'
+SWR_VALUE_MARKER = ',"value":'
+
+def _split_swr_entry(entry: bytes | str) -> tuple[bytes | str, float] | None:
+    """
+    (value JSON text, fresh_until), or None if the entry is not in the SWR layout
+    (e.g. a plain document written under the same key by an older release).
+    """
+    if isinstance(entry, bytes):
+        entry = entry.decode()
+    marker = entry.find(SWR_VALUE_MARKER)
+    if not entry.startswith(SWR_PREFIX) or marker == -1:
+        return None
+    try:
+        fresh_until = float(entry[len(SWR_PREFIX):marker])
+    except ValueError:
+        return None
+    return entry[marker + len(SWR_VALUE_MARKER):-1], fresh_until
+
+async def set_swr(key: str, value: Any, soft_ttl: int, hard_ttl: int, tags: Iterable[str] = ()):
+    data = serialization.dumps(value)
+    if isinstance(data, bytes):
+        data = data.decode()
+    entry = f"{SWR_PREFIX}{time.time() + soft_ttl}{SWR_VALUE_MARKER}{data}}}"
+    await tiered_cache.set_raw(key, entry, ttl=max(hard_ttl, soft_ttl), tags=tags)
+
+async def get_swr_raw(key: str, tags: Iterable[str] = ()) -> tuple[bytes | str | None, bool]:
+    """
+    Returns (value JSON text, is_stale); (None, False) on a miss.
+    """
+    entry = await tiered_cache.get_raw(key, tags)
+    split = _split_swr_entry(entry) if entry is not None else None
+    if split is None:
+        # Unrecognised entries count as a miss; the reload overwrites them
+        return None, False
+    data, fresh_until = split
+    return data, time.time() >= fresh_until
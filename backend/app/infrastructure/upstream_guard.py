@@ -0,0 +1,203 @@
+import httpx
+import logging
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from app.core import metrics
+from app.core.config import settings
+from app.infrastructure.async_redis_client import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    LIVE = 0         # live poller
+    INTERACTIVE = 1  # user-facing requests
+    BACKGROUND = 2   # schedule sync, social/news ingestion, debug routes
+
+# Share of the bucket each class must leave untouched, so background jobs
+# can never starve live polling (LIVE may drain the bucket completely)
+PRIORITY_RESERVE = {
+    Priority.LIVE: 0.0,
+    Priority.INTERACTIVE: 0.1,
+    Priority.BACKGROUND: 0.3,
+}
+
+class UpstreamUnavailable(Exception):
+    """
+    Raised instead of calling an upstream whose quota is spent or whose circuit is open.
+    """
+    def __init__(self, upstream: str, reason: str, retry_after: int = 30):
+        super().__init__(f"{upstream} unavailable: {reason}")
+        self.upstream = upstream
+        self.reason = reason
+        self.retry_after = retry_after
+
+# Refill-then-take token bucket, shared by every process.
+# ARGV: capacity, refill per second, now (ms), floor (tokens that must remain)
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local floor = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) / 1000 * rate)
+local allowed = 0
+if tokens - 1 >= floor then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 60000)
+return {allowed, tostring(tokens)}
+"""
+_take_token = async_redis_client.register_script(TOKEN_BUCKET_LUA)
+
+class CircuitBreaker:
+    """
+    Per-process breaker: opens after N consecutive failures, then lets a single
+    trial request through once the cooldown has passed (half-open).
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def cancel_trial(self):
+        """
+        The half-open trial never reached the upstream (e.g. no quota left).
+        """
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def retry_after(self) -> int:
+        if self.opened_at is None:
+            return 0
+        return max(1, int(self.reset_timeout - (time.monotonic() - self.opened_at)))
+
+def _is_upstream_failure(exc: Exception) -> bool:
+    """
+    Timeouts, connection errors, 429s and 5xx count against the breaker;
+    4xx caused by our own request (e.g. unknown fixture id) do not.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+class UpstreamGuard:
+    """
+    Quota (Redis token bucket) + circuit breaker in front of every upstream API.
+    """
+
+    def __init__(self):
+        self.limits = settings.UPSTREAM_QUOTAS
+        self.breakers = {
+            upstream: CircuitBreaker(settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT)
+            for upstream in self.limits
+        }
+
+    async def _acquire_token(self, upstream: str, priority: Priority) -> bool:
+        per_hour, burst = self.limits[upstream]
+        try:
+            allowed, _ = await _take_token(
+                keys=[f"quota:{upstream}"],
+                args=[burst, per_hour / 3600, int(time.time() * 1000), burst * PRIORITY_RESERVE[priority]]
+            )
+            return bool(allowed)
+        except Exception as e:
+            # Fail open: losing Redis must not take every upstream down with it
+            logger.warning(f"Quota check for {upstream} failed, allowing call: {e}")
+            return True
+
+    @asynccontextmanager
+    async def call(self, upstream: str, priority: Priority = Priority.BACKGROUND):
+        """
+        async with upstream_guard.call("sportmonks", Priority.LIVE):
+            response = await client.get(...)
+        """
+        breaker = self.breakers[upstream]
+        if not breaker.allow():
+            metrics.incr(f"upstream.{upstream}.circuit_rejected")
+            raise UpstreamUnavailable(upstream, "circuit open", breaker.retry_after())
+
+        if not await self._acquire_token(upstream, priority):
+            breaker.cancel_trial()
+            metrics.incr(f"upstream.{upstream}.quota_rejected.{priority.name.lower()}")
+            raise UpstreamUnavailable(upstream, f"quota exhausted for {priority.name.lower()} calls")
+
+        try:
+            yield
+        except Exception as e:
+            if _is_upstream_failure(e):
+                breaker.record_failure()
+                if breaker.state == "open":
+                    logger.error(f"Circuit opened for {upstream} after {breaker.failures} failures")
+            else:
+                breaker.record_success()
+            raise
+        except BaseException:
+            # Cancelled (e.g. by a wait_for timeout): no verdict on the upstream,
+            # but a half-open trial must not stay "in flight" forever
+            breaker.cancel_trial()
+            raise
+        else:
+            breaker.record_success()
+
+    async def get_stats(self) -> dict:
+        """
+        Remaining budget (tokens, refilled to now) and breaker state per upstream.
+        """
+        stats = {}
+        now_ms = int(time.time() * 1000)
+        for upstream, (per_hour, burst) in self.limits.items():
+            remaining = None
+            try:
+                tokens, ts = await async_redis_client.hmget(f"quota:{upstream}", "tokens", "ts")
+                if tokens is None:
+                    remaining = burst
+                else:
+                    refill = max(0, now_ms - int(ts)) / 1000 * per_hour / 3600
+                    remaining = round(min(burst, float(tokens) + refill), 2)
+            except Exception as e:
+                logger.warning(f"Could not read quota for {upstream}: {e}")
+            stats[upstream] = {
+                "remaining": remaining,
+                "capacity": burst,
+                "per_hour": per_hour,
+                "circuit": self.breakers[upstream].state,
+            }
+        return stats
+
+upstream_guard = UpstreamGuard()
@@ -1,14 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from app.core import logging
 from app.api.routes import matches, schedules, waitlist, engagement, news
-from app.services.live_snapshot_service import poll_and_store_live_matches
-from app.infrastructure.db import SessionLocal
-from app.services.schedule_service import sync_schedules_to_db
-from app.services.engagement_service import fetch_and_store_engagement
-from app.services.news_service import fetch_and_store_news
+from app.infrastructure.http_client import start_http_clients, close_http_clients
+from app.infrastructure.async_redis_client import close_redis
+from app.infrastructure.leader_election import leader_election
+from app.infrastructure.upstream_guard import UpstreamUnavailable
+from app.services.live_stream_service import live_stream_hub
+from app.services.metrics_service import collect_process_metrics, read_worker_metrics
+from app.infrastructure.tiered_cache import tiered_cache
+from app.core.http_cache import HTTPCacheMiddleware
+from app.core.config import settings
+from app.worker import start_background_tasks
 import os
-import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,10 +33,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+#ETag / If-None-Match / Cache-Control and precompressed bodies for the read routes (see CACHE_POLICIES)
+app.add_middleware(HTTPCacheMiddleware)
+#Plain gzip for every other response; it skips bodies that already have a Content-Encoding
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 @app.get("/health")
 def health():
     return {"status":"ok"}
 
+@app.exception_handler(UpstreamUnavailable)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailable):
+    #Nothing cached to fall back on: tell the client when to retry
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        **await collect_process_metrics(),
+        "stream_clients": live_stream_hub.client_count(),
+        "local_cache_entries": len(tiered_cache.local),
+        #Standalone ingestion workers (python -m app.worker) push theirs to Redis
+        "workers": await read_worker_metrics(),
+    }
+
 app.include_router(matches.router)
 app.include_router(schedules.router)
 app.include_router(waitlist.router)
@@ -39,72 +69,22 @@ app.include_router(news.router)
 
 @app.on_event("startup")
 async def startup_event():
-    #Live Poller (Background)
-    async def start_live_polling():
-        while True:
-            try:
-                await poll_and_store_live_matches()
-            except Exception as e:
-                logger.error(f"Live polling error: {e}")
-            await asyncio.sleep(30)
-
-    #Twitter Poller (every 90 mins)
-    async def start_twitter_polling():
-        while True:
-            try:
-                logger.info("Scheduled Task: Fetching Tweets...")
-                with SessionLocal() as db:
-                    await fetch_and_store_engagement(db, "twitter")
-            except Exception as e:
-                logger.error(f"Twitter polling error: {e}")
-            await asyncio.sleep(5400) # 90 minutes * 60s
-    
-    #YouTube Poller (Every 20 mins)
-    async def start_youtube_polling():
-        while True:
-            try:
-                logger.info("Scheduled Task: Fetching Videos...")
-                with SessionLocal() as db:
-                    await fetch_and_store_engagement(db, "youtube")
-            except Exception as e:
-                logger.error(f"YouTube polling error: {e}")
-            await asyncio.sleep(1200) # 20 minutes * 60s
-
-    #Schedule Sync (Background - NON-BLOCKING)
-    async def run_initial_sync():
-        logger.info("Starting background schedule sync...")
-        db = SessionLocal()
-        try:
-            await sync_schedules_to_db(db)
-            logger.info("Schedule sync completed successfully.")
-        except Exception as e:
-            logger.error(f"Startup schedule sync failed: {e}")
-        finally:
-            db.close()
-
-    #News Polling(every 4 hours)
-    async def start_news_polling():
-        while True:
-            try:
-                logger.info("Scheduled Task: Fetching News...")
-                with SessionLocal() as db:
-                    await fetch_and_store_news(db)
-            except Exception as e:
-                logger.error(f"News polling error: {e}")
-            
-            # Sleep for 4 hours (14400 seconds)
-            await asyncio.sleep(14400)
-
-    #We use create_task so startup finishes immediately
-    asyncio.create_task(start_live_polling())
-    asyncio.create_task(start_twitter_polling()) 
-    asyncio.create_task(start_youtube_polling())
-    asyncio.create_task(start_news_polling())
-    asyncio.create_task(run_initial_sync())
-    
-    logger.info("Server startup complete. Background tasks initiated.")
-
-
-
+    #Shared upstream connection pools (reused by every poller and route)
+    start_http_clients()
 
+    #Ingestion loops can also run in a dedicated process (python -m app.worker);
+    #set RUN_BACKGROUND_TASKS=false to keep this API process read-only
+    if settings.RUN_BACKGROUND_TASKS:
+        app.state.background_tasks = start_background_tasks()
+        logger.info("Server startup complete. Background tasks initiated.")
+    else:
+        logger.info("Server startup complete. Background tasks disabled (RUN_BACKGROUND_TASKS=false).")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    #Hand the lease over immediately instead of waiting for it to expire
+    await leader_election.release()
+    await live_stream_hub.close()
+    await tiered_cache.close()
+    await close_http_clients()
+    await close_redis()
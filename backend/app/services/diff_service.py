@@ -1,5 +1,21 @@
+import hashlib
+import json
 from app.domain.models import LiveMatch, MatchEvent, EventType
 
+def payload_fingerprint(raw: dict) -> str:
+    """
+    Stable content hash of a raw SportMonks payload (key order independent).
+    Equal fingerprints mean detect_changes would find nothing new.
+    """
+    canonical = json.dumps(raw, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+def snapshot_delta(old: dict, new: dict) -> dict:
+    """
+    Top-level fields of the new snapshot that differ from the old one.
+    """
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
 def detect_changes(old: LiveMatch | None, new: LiveMatch) -> list[MatchEvent]:
     events = []
     
@@ -63,4 +79,59 @@ def detect_changes(old: LiveMatch | None, new: LiveMatch) -> list[MatchEvent]:
     except (ValueError, TypeError):
         pass
 
-    return events
\ No newline at end of file
+    return events
+
+def _ball_events(match_id, ball: dict) -> list[MatchEvent]:
+    score = ball.get("score") if isinstance(ball.get("score"), dict) else {}
+    scoreboard = str(ball.get("scoreboard") or "S1")
+    inning = int(scoreboard.replace("S", "")) if scoreboard.replace("S", "").isdigit() else 1
+    over = ball.get("ball", 0.0)
+
+    def event(event_type: EventType, description: str) -> MatchEvent:
+        return MatchEvent(
+            match_id=match_id, event_type=event_type, description=description,
+            inning=inning, over=over, ball_id=ball.get("id")
+        )
+
+    events = []
+    if score.get("is_wicket") or "wicket" in (score.get("name") or "").lower():
+        events.append(event(EventType.WICKET, "Wicket!"))
+    if score.get("six"):
+        events.append(event(EventType.SIX, "SIX Runs!"))
+    elif score.get("four"):
+        events.append(event(EventType.FOUR, "FOUR runs!"))
+
+    # Sixth legal delivery closes the over (wides/no-balls repeat the ball number)
+    legal = score.get("ball", True)
+    if legal and f"{float(over):.1f}".endswith(".6"):
+        events.append(event(EventType.OVER_END, f"End of Over {int(float(over)) + 1}"))
+    return events
+
+def detect_ball_events(match_id, balls: list[dict], last_ball_id: int | None) -> tuple[list[MatchEvent], int | None]:
+    """
+    Exact per-ball events for the balls bowled since last_ball_id.
+    Balls arrive in id order, so only the tail after the cursor is parsed.
+    Returns the events and the new cursor. The first call only sets the
+    cursor, like detect_changes does for a match with no previous snapshot.
+    """
+    if not balls:
+        return [], last_ball_id
+
+    # Cursor comes from the newest ball that has an id
+    latest_id = next((ball["id"] for ball in reversed(balls) if ball.get("id") is not None), None)
+    if last_ball_id is None:
+        return [], latest_id
+
+    new_balls = []
+    for ball in reversed(balls):
+        if ball.get("id") is None or ball["id"] <= last_ball_id:
+            break
+        new_balls.append(ball)
+
+    events = []
+    for ball in reversed(new_balls):
+        events.extend(_ball_events(match_id, ball))
+    if latest_id is None:
+        return events, last_ball_id
+    return events, max(latest_id, last_ball_id)
+
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from app.models.sql_engagement import EngagementPost
 from app.infrastructure.social_api import social_api
+from app.infrastructure.tiered_cache import tiered_cache
 from app.services.normalizers.engagement_normalizer import normalize_twitter_response, normalize_youtube_response
 
 logger = logging.getLogger(__name__)
@@ -64,4 +65,7 @@ async def fetch_and_store_engagement(db: Session, platform: str):
         logger.info(f"Saved {saved_count} new {platform} posts.")
     except Exception as e:
         logger.error(f"Database commit failed: {e}")
-        db.rollback()
\ No newline at end of file
+        db.rollback()
+    else:
+        # Cached feed pages (Redis + every worker's local tier) are now out of date
+        await tiered_cache.invalidate("feed")
\ No newline at end of file
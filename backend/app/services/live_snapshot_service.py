@@ -1,80 +1,336 @@
 from app.services.polling_service import get_raw_live_matches, get_raw_live_match
 from app.services.normalizers.match_normalizer import normalize_live_match
-from app.services.diff_service import detect_changes
-from app.infrastructure.redis_client import set_json, get_json, push_event, redis_client
-from app.domain.models import LiveMatch
+from app.services.diff_service import detect_changes, detect_ball_events, payload_fingerprint
+from app.services.live_stream_service import LIVE_UPDATES_CHANNEL, build_update
+from app.services.poll_scheduler import PollScheduler, poll_scheduler, poll_interval
+from app.services.score_service import rebuild_live_scores_board
+from app.infrastructure.async_redis_client import set_json, append_event, pipeline, async_redis_client, async_redis_binary_client
+from app.infrastructure.upstream_guard import UpstreamUnavailable
+from app.infrastructure.tiered_cache import tiered_cache
+from app.infrastructure.compressed_store import store_variants
+from app.domain.models import LiveMatch, MatchEvent
+from app.core.config import settings
+from app.core.http_cache import make_etag
+from app.core import metrics, serialization
 
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.db import AsyncSessionLocal
 from app.models.sql_match import Match
+from sqlalchemy import select, update, case
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from typing import NamedTuple, Optional
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-async def poll_and_store_live_matches():
-    raw_wrapper = await get_raw_live_matches()
-    if not raw_wrapper or "data" not in raw_wrapper:
-        logger.warning("No live match data received")
-        redis_client.delete("live:matches")
+# Monotonic counter bumped once per cycle that changes the live view
+LIVE_VERSION_KEY = "live:version"
+
+# Every live snapshot in one pre-serialized document, and its ETag
+LIVE_DOCUMENT_KEY = "live:all"
+LIVE_DOCUMENT_ETAG_KEY = "live:all:etag"
+
+def polled_at_key(match_id) -> str:
+    """
+    Epoch time of the last successful fetch of a match, changed or not.
+    """
+    return f"live:polled_at:{match_id}"
+
+# Outcomes of a single match poll
+PROCESSED = "processed"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+class PreviousState(NamedTuple):
+    snapshot: Optional[dict] = None
+    fingerprint: Optional[str] = None
+    last_ball_id: Optional[int] = None
+
+class MatchPollResult(NamedTuple):
+    outcome: str
+    match: Optional[LiveMatch] = None
+    events: list[MatchEvent] = []
+    fingerprint: Optional[str] = None
+    last_ball_id: Optional[int] = None
+
+async def process_live_match(
+    match_id,
+    semaphore: asyncio.Semaphore,
+    previous: PreviousState
+) -> MatchPollResult:
+    """
+    Fetches, normalizes and diffs a single live match against the previous
+    snapshot. Does no Redis I/O; the caller writes all results in one batch.
+    """
+    try:
+        # --- A. Fetch Full Details (for Scorecard/Innings) ---
+        # The semaphore caps concurrent upstream calls; the timeout only
+        # covers the fetch itself so queueing never counts against a match.
+        async with semaphore:
+            raw_detail = await asyncio.wait_for(
+                get_raw_live_match(str(match_id)),
+                timeout=settings.LIVE_POLL_MATCH_TIMEOUT
+            )
+
+        # Check if detail fetch actually got data (SportMonks wrapper inside 'data' key)
+        if "data" in raw_detail:
+            raw_detail = raw_detail["data"]
+
+        # --- B. Skip unchanged payloads ---
+        # Identical upstream data cannot produce new events or a different view
+        fingerprint = payload_fingerprint(raw_detail)
+        if previous.fingerprint == fingerprint:
+            metrics.incr("live_snapshots.skipped")
+            return MatchPollResult(SKIPPED)
+
+        # --- C. Normalize ---
+        new_match: LiveMatch = normalize_live_match(raw_detail)
+
+        # --- D. Diffing ---
+        # Exact per-ball events when the payload has balls; aggregate score diffing otherwise
+        balls = raw_detail.get("balls")
+        last_ball_id = previous.last_ball_id
+        if isinstance(balls, list) and balls:
+            events, last_ball_id = detect_ball_events(new_match.match_id, balls, previous.last_ball_id)
+        else:
+            old_match = LiveMatch(**previous.snapshot) if previous.snapshot else None
+            events = detect_changes(old_match, new_match)
+
+        metrics.incr("live_snapshots.processed")
+        return MatchPollResult(PROCESSED, new_match, events, fingerprint, last_ball_id)
+
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out fetching match {match_id} after {settings.LIVE_POLL_MATCH_TIMEOUT}s, skipping this cycle")
+    except UpstreamUnavailable as e:
+        logger.warning(f"Skipping match {match_id}: {e}")
+    except Exception as e:
+        logger.exception(f"Error processing match {match_id}: {str(e)}")
+    return MatchPollResult(FAILED)
+
+async def load_previous_state(match_ids: list[str]) -> tuple[list[PreviousState], str | None]:
+    """
+    Old snapshot, payload fingerprint and ball cursor of every due match, plus
+    the current live index, in a single MGET.
+    """
+    keys = []
+    for mid in match_ids:
+        keys += [f"live:match:{mid}", f"live:fingerprint:{mid}", f"live:lastball:{mid}"]
+    raw = await async_redis_client.mget(keys + ["live:matches"])
+
+    states = []
+    for i in range(0, len(match_ids) * 3, 3):
+        snapshot, fingerprint, last_ball_id = raw[i:i + 3]
+        states.append(PreviousState(
+            serialization.loads(snapshot) if snapshot else None,
+            fingerprint,
+            int(last_ball_id) if last_ball_id else None
+        ))
+    return states, raw[-1]
+
+async def write_cycle(
+    results: list[MatchPollResult],
+    live_match_ids: list[str],
+    version: int | None = None,
+    polled_ids: list[str] = ()
+):
+    """
+    Writes events, snapshots, fingerprints and the live index in one MULTI/EXEC
+    pipeline, then publishes stream updates (which need the new event IDs) in a
+    second one, so a cycle costs a constant number of round-trips.
+    Every snapshot written in this cycle is stamped with the cycle's version.
+    polled_ids (fetched this cycle, changed or not) get a fresh polled-at time.
+    """
+    processed = [r for r in results if r.outcome == PROCESSED]
+    for r in processed:
+        r.match.version = version or 0
+    snapshots = {r.match.match_id: r.match.model_dump(mode='json') for r in processed}
+    events = [
+        (r.match.match_id, event.model_dump(mode='json'))
+        for r in processed for event in r.events
+    ]
+
+    pipe = pipeline()
+    # Appends go first so their entry IDs are the first results of the pipeline
+    for match_id, event in events:
+        await append_event(
+            f"match:stream:{match_id}", event, event["event_id"],
+            maxlen=settings.MATCH_EVENT_STREAM_MAXLEN, client=pipe
+        )
+
+    for r in processed:
+        match_id = r.match.match_id
+        # Save to Redis (TTL 24 hours to keep finished match results available for a while)
+        await set_json(f"live:match:{match_id}", snapshots[match_id], ttl=86400, client=pipe)
+        await pipe.set(f"live:fingerprint:{match_id}", r.fingerprint, ex=86400)
+        if r.last_ball_id is not None:
+            await pipe.set(f"live:lastball:{match_id}", r.last_ball_id, ex=86400)
+
+        # Recent versions, so /live?since_version can answer with a delta
+        history_key = f"live:history:{match_id}"
+        await pipe.lpush(history_key, serialization.dumps(snapshots[match_id]))
+        await pipe.ltrim(history_key, 0, settings.LIVE_SNAPSHOT_HISTORY - 1)
+        await pipe.expire(history_key, 3600)
+
+    # Unchanged payloads keep their snapshot (and last_updated); this says the data was still current
+    polled_at = time.time()
+    for match_id in polled_ids:
+        await pipe.set(polled_at_key(match_id), polled_at, ex=86400)
+
+    if live_match_ids:
+        await pipe.set("live:matches", ",".join(live_match_ids), ex=60)
+        await pipe.expire(LIVE_DOCUMENT_KEY, 60)
+        await pipe.expire(LIVE_DOCUMENT_ETAG_KEY, 60)
+    else:
+        # Like the no-data branch: a stale index would keep finished matches in
+        # since_version deltas and bump the version on every list refresh
+        await pipe.delete("live:matches")
+    written = await pipe.execute()
+
+    if not processed:
         return
-    
-    matches = raw_wrapper.get("data", [])    
-    live_match_ids = []
-
-    with SessionLocal() as db:
-        for match_meta in matches:
-            match_id = match_meta.get("id")
-            if not match_id:
-                continue
-                
-            try:
-                # --- A. Fetch Full Details (for Scorecard/Innings) ---
-                raw_detail = await get_raw_live_match(str(match_id))
-                
-                # Check if detail fetch actually got data (SportMonks wrapper inside 'data' key)
-                if "data" in raw_detail:
-                    raw_detail = raw_detail["data"]
-                
-                # --- B. Normalize ---
-                new_match: LiveMatch = normalize_live_match(raw_detail)
-                live_match_ids.append(str(match_id))
-                
-                # --- C. Redis Logic (Diffing) ---
-                redis_key = f"live:match:{match_id}"
-                old_data = get_json(redis_key)
-                old_match = LiveMatch(**old_data) if old_data else None
-
-                events = detect_changes(old_match, new_match)
-                
-                if events:
-                    event_key = f"match:events:{match_id}"
-                    for event in events:
-                        push_event(event_key, event.model_dump(mode='json'))
-                    # logger.info(f"Pushed {len(events)} events for {match_id}")
-
-                # Save to Redis (TTL 24 hours to keep finished match results available for a while)
-                set_json(redis_key, new_match.model_dump(mode='json'), ttl=86400)
-                
-                # --- D. SQL Status Sync (The Fix) ---
-                # We check the DB to see if the status needs updating (e.g., NS -> LIVE)
-                sql_match = db.query(Match).filter(Match.match_id == str(match_id)).first()
-                
-                if sql_match:
-                    # Only update if status implies a state change (ignore minor string differences if needed)
-                    # For now, we update if strings are not equal
-                    if sql_match.status != new_match.status:
-                        logger.info(f"SYNC SQL: Match {match_id} status {sql_match.status} -> {new_match.status}")
-                        sql_match.status = new_match.status
-                        # If the match just finished, we might want to trigger a full update, 
-                        # but for now, just updating status is enough for the List View.
-                        db.commit()
 
+    # Notify stream subscribers in every API process (duplicates were not appended)
+    pipe = pipeline(transaction=False)
+    for (match_id, event), entry_id in zip(events, written):
+        if entry_id:
+            await pipe.publish(LIVE_UPDATES_CHANNEL, build_update(match_id, "event", {**event, "id": entry_id}))
+    for match_id, snapshot in snapshots.items():
+        await pipe.publish(LIVE_UPDATES_CHANNEL, build_update(match_id, "snapshot", snapshot))
+    # Snapshots were written straight to Redis; drop stale copies from every API process
+    await tiered_cache.broadcast(keys=[f"live:match:{match_id}" for match_id in snapshots], client=pipe)
+    await pipe.execute()
+
+async def write_live_document(version: int, live_match_ids: list[str]):
+    """
+    Rebuilds the aggregated /matches/live document from the stored snapshots.
+    The snapshot strings are spliced in as they are, so nothing is parsed or
+    re-serialized here nor on the read path.
+    """
+    raw = await async_redis_client.mget([f"live:match:{mid}" for mid in live_match_ids]) if live_match_ids else []
+    document = '{"version":%d,"data":[%s]}' % (version, ",".join(r for r in raw if r))
+
+    etag = make_etag(document)
+
+    # Compressed variants first, so the document is never served before they exist
+    binary_pipe = async_redis_binary_client.pipeline(transaction=False)
+    await store_variants(etag, document, client=binary_pipe)
+    await binary_pipe.execute()
+
+    # Same lifetime as the live:matches index; write_cycle extends both every cycle
+    pipe = pipeline()
+    await pipe.set(LIVE_DOCUMENT_KEY, document, ex=60)
+    await pipe.set(LIVE_DOCUMENT_ETAG_KEY, etag, ex=60)
+    await pipe.execute()
+
+async def sync_match_statuses(db: AsyncSession, live_matches: list[LiveMatch]) -> int:
+    """
+    Brings Match.status in line with the live snapshots (e.g., NS -> LIVE)
+    so the List View reflects the current state. Returns the number of rows changed.
+    """
+    new_statuses = {str(m.match_id): m.status for m in live_matches}
+    result = await db.execute(
+        select(Match.match_id, Match.status)
+        .where(Match.match_id.in_(list(new_statuses)))
+    )
+    rows = result.all()
+
+    # Only update if strings are not equal
+    changed = {}
+    for row in rows:
+        if row.status != new_statuses[row.match_id]:
+            logger.info(f"SYNC SQL: Match {row.match_id} status {row.status} -> {new_statuses[row.match_id]}")
+            changed[row.match_id] = new_statuses[row.match_id]
+
+    if not changed:
+        return 0
+
+    stmt = update(Match)\
+        .where(Match.match_id.in_(list(changed)))\
+        .values(status=case(changed, value=Match.match_id))\
+        .execution_options(synchronize_session=False)
+    await db.execute(stmt)
+    await db.commit()
+    return len(changed)
+
+async def poll_and_store_live_matches(scheduler: PollScheduler = poll_scheduler) -> float:
+    """
+    Polls every live match that is due according to the scheduler.
+    Returns the number of seconds until the next match is due.
+    """
+    if scheduler.list_due():
+        try:
+            raw_wrapper = await get_raw_live_matches()
+        except UpstreamUnavailable as e:
+            # Keep serving the last known live index and snapshots until SportMonks is back
+            logger.warning(f"Live list unavailable, keeping cached snapshots: {e}")
+            for key in ("live:matches", LIVE_DOCUMENT_KEY, LIVE_DOCUMENT_ETAG_KEY):
+                await async_redis_client.expire(key, 60)
+            return max(e.retry_after, settings.LIVE_POLL_MIN_SLEEP)
+        if not raw_wrapper or "data" not in raw_wrapper:
+            logger.warning("No live match data received")
+            if await async_redis_client.delete("live:matches"):
+                await write_live_document(await async_redis_client.incr(LIVE_VERSION_KEY), [])
+            scheduler.set_live_ids([])
+            return scheduler.seconds_until_next()
+
+        matches = raw_wrapper.get("data", [])
+        scheduler.set_live_ids([m.get("id") for m in matches if m.get("id")])
+
+    match_ids = scheduler.due_matches()
+    previous_states, previous_index = await load_previous_state(match_ids)
+
+    # Fan out: cycle wall-time tracks the slowest match, not the sum of all of them
+    semaphore = asyncio.Semaphore(max(1, settings.LIVE_POLL_CONCURRENCY))
+    results = await asyncio.gather(*(
+        process_live_match(mid, semaphore, previous)
+        for mid, previous in zip(match_ids, previous_states)
+    ))
+    processed = [r.match for r in results if r.outcome == PROCESSED]
+
+    # Next poll per match depends on its phase. Unchanged matches keep their
+    # previous interval and failed fetches retry at the default rate.
+    for mid, result in zip(match_ids, results):
+        if result.outcome == PROCESSED:
+            interval = poll_interval(result.match)
+        elif result.outcome == SKIPPED:
+            interval = scheduler.last_interval(mid)
+        else:
+            interval = settings.LIVE_POLL_INTERVAL
+        scheduler.schedule(mid, interval)
+
+    # Matches not due this cycle still have a valid snapshot from an earlier one
+    live_match_ids = [mid for mid in scheduler.live_ids if scheduler.has_polled(mid)]
+
+    # One version per cycle that changed anything (a snapshot or the set of live matches)
+    version = None
+    if processed or ",".join(live_match_ids) != (previous_index or ""):
+        version = await async_redis_client.incr(LIVE_VERSION_KEY)
+    polled_ids = [mid for mid, result in zip(match_ids, results) if result.outcome != FAILED]
+    await write_cycle(results, live_match_ids, version, polled_ids)
+    if version is not None:
+        await write_live_document(version, live_match_ids)
+
+    # --- E. SQL Status Sync (one query, one UPDATE, one commit per cycle) ---
+    if processed:
+        async with AsyncSessionLocal() as db:
+            try:
+                await sync_match_statuses(db, processed)
             except Exception as e:
-                logger.exception(f"Error processing match {match_id}: {str(e)}")
-                continue
-    
+                logger.exception(f"SQL status sync failed: {str(e)}")
+                await db.rollback()
 
-    if live_match_ids:
-        redis_client.set("live:matches", ",".join(live_match_ids), ex=60)
-    
-    logger.info(f"Polled {len(live_match_ids)} matches. SQL Sync complete.")
\ No newline at end of file
+    # --- F. Livescore board (when its inputs changed, or to roll its time window) ---
+    if version is not None or scheduler.board_due():
+        try:
+            await rebuild_live_scores_board()
+        except Exception as e:
+            logger.exception(f"Livescore board rebuild failed: {str(e)}")
+        # Also after a failure: with Postgres down, retrying on every loop would
+        # keep the poller spinning at LIVE_POLL_MIN_SLEEP
+        scheduler.board_rebuilt()
+
+    skipped = sum(1 for r in results if r.outcome == SKIPPED)
+    logger.info(f"Polled {len(match_ids)} due matches ({len(processed)} changed, {skipped} unchanged, {len(live_match_ids)} live). SQL Sync complete.")
+    return scheduler.seconds_until_next()
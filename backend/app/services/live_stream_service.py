@@ -0,0 +1,108 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from app.core import metrics
+from app.core.config import settings
+from app.infrastructure.async_redis_client import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+# The poller publishes every snapshot and match event here (see write_cycle)
+LIVE_UPDATES_CHANNEL = "live:updates"
+
+def build_update(match_id, update_type: str, data: dict) -> str:
+    """
+    Pub/sub envelope: {"match_id": ..., "type": "snapshot" | "event", "data": {...}}
+    """
+    return json.dumps({"match_id": str(match_id), "type": update_type, "data": data}, default=str)
+
+def format_sse(update_type: str, data: dict, event_id: str | None = None) -> str:
+    # 'id:' lets EventSource resume with Last-Event-ID after a reconnect
+    id_line = f"id: {event_id}\n" if event_id else ""
+    return f"{id_line}event: {update_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def stream_id_key(event_id: str) -> tuple[int, int]:
+    """
+    Sort key for Redis Stream IDs ("<ms>-<seq>").
+    """
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+class LiveStreamHub:
+    """
+    Fans the live updates channel out to connected stream clients.
+    Each process holds exactly one Redis subscription no matter how many clients
+    are connected; every message is formatted once and shared by all of them.
+    Queue items are (event_id, frame) tuples; event_id is None for snapshots.
+    """
+
+    def __init__(self, channel: str = LIVE_UPDATES_CHANNEL, queue_size: int = settings.STREAM_CLIENT_QUEUE_SIZE):
+        self.channel = channel
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._reader: asyncio.Task | None = None
+
+    def subscribe(self, match_id) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[str(match_id)].add(queue)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop())
+        return queue
+
+    def unsubscribe(self, match_id, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(str(match_id))
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[str(match_id)]
+
+    def client_count(self) -> int:
+        return sum(len(s) for s in self._subscribers.values())
+
+    def dispatch(self, raw: str):
+        update = json.loads(raw)
+        subscribers = self._subscribers.get(update.get("match_id"))
+        if not subscribers:
+            return
+
+        event_id = update["data"].get("id") if update["type"] == "event" else None
+        frame = format_sse(update["type"], update["data"], event_id)
+        for queue in subscribers:
+            # Bounded queues: a slow client loses its oldest frames instead of growing memory
+            if queue.full():
+                queue.get_nowait()
+                metrics.incr("live_stream.dropped")
+            queue.put_nowait((event_id, frame))
+
+    async def _read_loop(self):
+        while True:
+            pubsub = async_redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        self.dispatch(message["data"])
+                    except Exception as e:
+                        logger.warning(f"Dropping malformed live update: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live stream subscription error, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def close(self):
+        if self._reader and not self._reader.done():
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        self._reader = None
+
+live_stream_hub = LiveStreamHub()
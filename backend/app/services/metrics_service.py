@@ -0,0 +1,58 @@
+from app.core import metrics, serialization
+from app.core.config import settings
+from app.infrastructure.async_redis_client import async_redis_client
+from app.infrastructure.http_client import get_http_stats
+from app.infrastructure.upstream_guard import upstream_guard
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# One snapshot per ingestion worker, refreshed every WORKER_METRICS_INTERVAL.
+# Expires after a few missed pushes, so stopped workers drop out of /metrics.
+WORKER_METRICS_PREFIX = "metrics:worker:"
+
+async def collect_process_metrics() -> dict:
+    """
+    This process's counters, connection reuse and upstream breaker states.
+    """
+    return {
+        "http": get_http_stats(),
+        "upstreams": await upstream_guard.get_stats(),
+        "counters": metrics.snapshot(),
+    }
+
+async def publish_worker_metrics(worker_id: str, is_leader: bool):
+    snapshot = {**await collect_process_metrics(), "is_leader": is_leader}
+    await async_redis_client.set(
+        f"{WORKER_METRICS_PREFIX}{worker_id}",
+        serialization.dumps(snapshot),
+        ex=int(settings.WORKER_METRICS_INTERVAL * 3)
+    )
+
+async def read_worker_metrics() -> dict:
+    """
+    Latest snapshot of every running worker, keyed by worker id.
+    """
+    try:
+        keys = [key async for key in async_redis_client.scan_iter(match=f"{WORKER_METRICS_PREFIX}*")]
+        snapshots = await async_redis_client.mget(keys) if keys else []
+    except Exception as e:
+        logger.warning(f"Could not read worker metrics: {e}")
+        return {}
+    return {
+        key.removeprefix(WORKER_METRICS_PREFIX): serialization.loads(data)
+        for key, data in zip(keys, snapshots) if data
+    }
+
+async def start_metrics_publishing(worker_id: str, is_leader):
+    """
+    Pushes this worker's metrics to Redis for the API's /metrics, since a
+    standalone worker serves no HTTP itself. 'is_leader' is read on every push.
+    """
+    while True:
+        try:
+            await publish_worker_metrics(worker_id, is_leader())
+        except Exception as e:
+            logger.warning(f"Could not publish worker metrics: {e}")
+        await asyncio.sleep(settings.WORKER_METRICS_INTERVAL)
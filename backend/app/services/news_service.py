@@ -6,6 +6,7 @@ from sqlalchemy.dialects.postgresql import insert
 
 from app.infrastructure.external_api import news_api
 from app.models.sql_news import NewsArticle
+from app.infrastructure.tiered_cache import tiered_cache
 
 logger = logging.getLogger(__name__)
 
@@ -78,4 +79,6 @@ async def fetch_and_store_news(db: Session):
         logger.info(f"Saved/Updated {saved_count} news articles.")
     except Exception as e:
         db.rollback()
-        logger.error(f"Database commit failed for news: {e}")
\ No newline at end of file
+        logger.error(f"Database commit failed for news: {e}")
+    else:
+        await tiered_cache.invalidate("news")
\ No newline at end of file
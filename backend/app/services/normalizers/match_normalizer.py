@@ -34,6 +34,7 @@ def normalize_live_match(raw: dict) -> LiveMatch:
     return LiveMatch(
         match_id=raw["id"],
         status=raw.get("status", "Unknown"),
+        match_type=raw.get("type"),
         note=note,
         innings=innings_list,
         toss_won_team_id=raw.get("toss_won_team_id"),
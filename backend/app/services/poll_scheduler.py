@@ -0,0 +1,107 @@
+import time
+from app.domain.models import LiveMatch
+from app.core.config import settings
+
+# SportMonks status strings grouped by how fast the score can move
+FINISHED_STATUSES = {"Finished", "Aban.", "Cancl.", "Postp."}
+BREAK_STATUSES = {"Innings Break", "Tea Break", "Lunch", "Dinner"}
+DELAYED_STATUSES = {"Delayed", "Int."}
+
+# Overs per innings for limited-overs formats (Tests have no death phase)
+FORMAT_OVERS = {"T10": 10, "T20": 20, "T20I": 20, "ODI": 50, "List A": 50}
+
+# Last 20% of an innings (T20: overs 16-20, ODI: overs 40-50)
+DEATH_PHASE_FRACTION = 0.2
+
+def is_death_phase(match: LiveMatch) -> bool:
+    """
+    True when the active inning is in its final overs or the batting side is
+    down to its last couple of wickets - the phases where every ball matters.
+    """
+    if not match.innings:
+        return False
+
+    active = max(match.innings, key=lambda x: x.inning)
+    if active.wickets >= 8:
+        return True
+
+    total_overs = FORMAT_OVERS.get(match.match_type or "")
+    if not total_overs:
+        return False
+    return active.overs >= total_overs * (1 - DEATH_PHASE_FRACTION)
+
+def poll_interval(match: LiveMatch) -> float:
+    """
+    Seconds until this match should be fetched again, based on its phase.
+    """
+    status = match.status or ""
+    if status in FINISHED_STATUSES:
+        return settings.LIVE_POLL_FINISHED_INTERVAL
+    if status in BREAK_STATUSES or status.startswith("Stump"):
+        return settings.LIVE_POLL_BREAK_INTERVAL
+    if status in DELAYED_STATUSES:
+        return settings.LIVE_POLL_DELAYED_INTERVAL
+    if is_death_phase(match):
+        return settings.LIVE_POLL_DEATH_INTERVAL
+    return settings.LIVE_POLL_INTERVAL
+
+class PollScheduler:
+    """
+    Tracks the next poll time of every live match, the livescores list and
+    the periodic livescore board rebuild.
+    Times are time.monotonic() values; 'now' can be passed in for tests.
+    """
+
+    def __init__(self):
+        self._next_poll: dict[str, float] = {}
+        self._intervals: dict[str, float] = {}
+        self._next_list_refresh = 0.0
+        self._next_board_rebuild = 0.0
+        self.live_ids: list[str] = []
+
+    def list_due(self, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now >= self._next_list_refresh
+
+    def set_live_ids(self, match_ids: list[str], now: float | None = None):
+        """
+        Stores the latest livescores list and forgets matches that dropped off it.
+        """
+        now = time.monotonic() if now is None else now
+        self.live_ids = [str(mid) for mid in match_ids]
+        self._next_list_refresh = now + settings.LIVE_LIST_REFRESH_INTERVAL
+        self._next_poll = {mid: t for mid, t in self._next_poll.items() if mid in self.live_ids}
+        self._intervals = {mid: i for mid, i in self._intervals.items() if mid in self.live_ids}
+
+    def due_matches(self, now: float | None = None) -> list[str]:
+        now = time.monotonic() if now is None else now
+        return [mid for mid in self.live_ids if self._next_poll.get(mid, 0.0) <= now]
+
+    def has_polled(self, match_id) -> bool:
+        return str(match_id) in self._next_poll
+
+    def schedule(self, match_id, interval: float, now: float | None = None):
+        now = time.monotonic() if now is None else now
+        self._next_poll[str(match_id)] = now + interval
+        self._intervals[str(match_id)] = interval
+
+    def last_interval(self, match_id) -> float:
+        return self._intervals.get(str(match_id), settings.LIVE_POLL_INTERVAL)
+
+    def board_due(self, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now >= self._next_board_rebuild
+
+    def board_rebuilt(self, now: float | None = None):
+        now = time.monotonic() if now is None else now
+        self._next_board_rebuild = now + settings.LIVESCORE_BOARD_REFRESH_INTERVAL
+
+    def seconds_until_next(self, now: float | None = None) -> float:
+        """
+        Sleep until the next match (or the livescores list, or the board) is due.
+        """
+        now = time.monotonic() if now is None else now
+        wake_at = min([self._next_list_refresh, self._next_board_rebuild, *self._next_poll.values()])
+        return max(wake_at - now, settings.LIVE_POLL_MIN_SLEEP)
+
+poll_scheduler = PollScheduler()
@@ -1,4 +1,5 @@
 from app.infrastructure.external_api import sportmonks_api
+from app.infrastructure.upstream_guard import UpstreamUnavailable, Priority
 import logging
 
 logger = logging.getLogger(__name__)
@@ -7,15 +8,19 @@ logger = logging.getLogger(__name__)
 async def get_raw_live_matches():
     try:
         return await sportmonks_api.fetch_live_matches_raw()
+    except UpstreamUnavailable:
+        raise
     except Exception:
         logger.exception("Failed to fetch live matches from SportMonks API")
         raise
 
-async def get_raw_live_match(match_id: int):
+async def get_raw_live_match(match_id: int, priority: Priority = Priority.LIVE):
     try:
-        payload = await sportmonks_api.fetch_match_by_id_raw(match_id)
+        payload = await sportmonks_api.fetch_match_by_id_raw(match_id, priority=priority)
         return payload.get("data", {})
-    
+
+    except UpstreamUnavailable:
+        raise
     except Exception:
         logger.exception(f"Failed to fetch raw match data for ID: {match_id}")
         raise
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 
 from app.infrastructure.external_api import sportmonks_api
 from app.models.sql_match import Match
+from app.services.score_service import rebuild_live_scores_board
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +148,12 @@ async def sync_schedules_to_db(db: Session):
         db.commit()
         logger.info(f"Successfully synced {count} fixtures (with scores) to Database.")
 
+        # Fixtures and results feed the livescore board
+        try:
+            await rebuild_live_scores_board()
+        except Exception:
+            logger.exception("Livescore board rebuild after schedule sync failed")
+
     except Exception:
         logger.exception("Failed to sync schedules")
         db.rollback()
@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
 import json
 
@@ -9,20 +10,34 @@ from app.domain.models.livescore_view import (
     TeamsContainer, ScoresContainer, ScoreView, 
     CurrentView, TossView
 )
-from app.infrastructure.redis_client import redis_client
+from app.infrastructure.async_redis_client import async_redis_client, async_redis_binary_client, pipeline
+from app.infrastructure.compressed_store import store_variants
+from app.infrastructure.db import AsyncSessionLocal
+from app.core.config import settings
+from app.core.http_cache import make_etag
+from pydantic import TypeAdapter
 
-def get_live_scores_view(db: Session) -> list[LiveScoreCard]:
+# Serialized board (what /livescore returns verbatim) and its ETag
+LIVESCORE_BOARD_KEY = "livescore:board"
+LIVESCORE_BOARD_ETAG_KEY = "livescore:board:etag"
+
+_board_adapter = TypeAdapter(list[LiveScoreCard])
+
+async def get_live_scores_view(db: AsyncSession) -> list[LiveScoreCard]:
     # 1. Define Time Window (UTC Now - 24h to + 36h)
     utc_now = datetime.now(timezone.utc)
     start_window = utc_now - timedelta(hours=24)
     end_window = utc_now + timedelta(hours=36)
 
     # 2. Query SQL
-    sql_matches = db.query(Match).filter(
-        Match.start_time >= start_window,
-        Match.start_time <= end_window,
-        Match.status != "Abandoned"
-    ).order_by(Match.start_time).all()
+    result = await db.execute(
+        select(Match).where(
+            Match.start_time >= start_window,
+            Match.start_time <= end_window,
+            Match.status != "Abandoned"
+        ).order_by(Match.start_time)
+    )
+    sql_matches = result.scalars().all()
 
     if not sql_matches:
         return []
@@ -37,7 +52,7 @@ def get_live_scores_view(db: Session) -> list[LiveScoreCard]:
     redis_map = {}
     if live_ids:
         keys = [f"live:match:{mid}" for mid in live_ids]
-        raw_list = redis_client.mget(keys)
+        raw_list = await async_redis_client.mget(keys)
         for mid, raw in zip(live_ids, raw_list):
             if raw:
                 try:
@@ -123,4 +138,28 @@ def get_live_scores_view(db: Session) -> list[LiveScoreCard]:
         )
         results.append(card)
 
-    return results
\ No newline at end of file
+    return results
+
+async def rebuild_live_scores_board() -> bytes:
+    """
+    Materializes the livescore board as a ready-to-serve JSON document.
+    Called by the poller and the schedule sync when their inputs change; the
+    key is only rewritten when the serialized board actually differs.
+    """
+    async with AsyncSessionLocal() as db:
+        cards = await get_live_scores_view(db)
+    document = _board_adapter.dump_json(cards)
+    etag = make_etag(document)
+
+    pipe = pipeline()
+    if await async_redis_client.get(LIVESCORE_BOARD_ETAG_KEY) == etag:
+        await pipe.expire(LIVESCORE_BOARD_KEY, settings.LIVESCORE_BOARD_TTL)
+        await pipe.expire(LIVESCORE_BOARD_ETAG_KEY, settings.LIVESCORE_BOARD_TTL)
+    else:
+        binary_pipe = async_redis_binary_client.pipeline(transaction=False)
+        await store_variants(etag, document, client=binary_pipe)
+        await binary_pipe.execute()
+        await pipe.set(LIVESCORE_BOARD_KEY, document, ex=settings.LIVESCORE_BOARD_TTL)
+        await pipe.set(LIVESCORE_BOARD_ETAG_KEY, etag, ex=settings.LIVESCORE_BOARD_TTL)
+    await pipe.execute()
+    return document
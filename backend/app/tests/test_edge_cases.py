@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime
 from app.services.normalizers.engagement_normalizer import is_valid_content
-from app.services.diff_service import detect_changes
+from app.services.diff_service import detect_changes, detect_ball_events, payload_fingerprint, snapshot_delta
 from app.domain.models.live import LiveMatch, InningScore
 from app.domain.models.event import EventType
 
@@ -101,4 +101,78 @@ def test_diff_service_new_inning_no_crash():
     
     # Should return empty list (no events for starting 0/0) or just not crash
     events = detect_changes(old_match, new_match)
-    assert isinstance(events, list)
\ No newline at end of file
+    assert isinstance(events, list)
+# Live Snapshot Fingerprint Tests
+def test_payload_fingerprint_ignores_key_order():
+    """Test that the same payload hashes the same regardless of key order."""
+    a = {"id": 1, "status": "Live", "runs": [{"inning": 1, "score": 100}]}
+    b = {"runs": [{"score": 100, "inning": 1}], "status": "Live", "id": 1}
+    assert payload_fingerprint(a) == payload_fingerprint(b)
+
+def test_payload_fingerprint_detects_change():
+    """Test that a single run changes the fingerprint."""
+    a = {"id": 1, "runs": [{"inning": 1, "score": 100}]}
+    b = {"id": 1, "runs": [{"inning": 1, "score": 101}]}
+    assert payload_fingerprint(a) != payload_fingerprint(b)
+
+def test_snapshot_delta_only_changed_fields():
+    """Test that a delta carries only the fields that changed."""
+    old = {"match_id": 1, "status": "1st Innings", "note": "", "version": 3}
+    new = {"match_id": 1, "status": "Innings Break", "note": "", "version": 4}
+    assert snapshot_delta(old, new) == {"status": "Innings Break", "version": 4}
+
+# Ball-by-ball Event Tests
+def create_ball(ball_id, over, runs=0, four=False, six=False, is_wicket=False, legal=True):
+    """Helper to create a raw SportMonks ball."""
+    return {
+        "id": ball_id, "scoreboard": "S1", "ball": over,
+        "score": {"runs": runs, "four": four, "six": six, "is_wicket": is_wicket, "ball": legal}
+    }
+
+def test_ball_events_first_poll_sets_cursor_only():
+    """Test that the first poll does not replay the whole innings."""
+    balls = [create_ball(1, 0.1, runs=4, four=True), create_ball(2, 0.2)]
+    events, cursor = detect_ball_events(123, balls, None)
+    assert events == []
+    assert cursor == 2
+
+def test_ball_events_catches_two_boundaries_in_one_window():
+    """Test that two boundaries between polls are both reported."""
+    balls = [
+        create_ball(1, 0.1),
+        create_ball(2, 0.2, runs=4, four=True),
+        create_ball(3, 0.3, runs=4, four=True),
+    ]
+    events, cursor = detect_ball_events(123, balls, 1)
+    assert [e.event_type for e in events] == [EventType.FOUR, EventType.FOUR]
+    assert cursor == 3
+
+def test_ball_events_wicket_and_over_end():
+    """Test that a wicket on the last ball also closes the over."""
+    balls = [create_ball(5, 3.5), create_ball(6, 3.6, is_wicket=True)]
+    events, _ = detect_ball_events(123, balls, 5)
+    assert [e.event_type for e in events] == [EventType.WICKET, EventType.OVER_END]
+    assert "End of Over 4" in events[1].description
+
+def test_ball_events_wide_does_not_end_over():
+    """Test that an illegal delivery numbered .6 does not end the over."""
+    balls = [create_ball(7, 2.6, runs=1, legal=False)]
+    events, _ = detect_ball_events(123, balls, 6)
+    assert events == []
+
+def test_ball_events_newest_ball_without_id_keeps_cursor():
+    """Test that a newest ball with no id does not break the cursor."""
+    balls = [create_ball(1, 0.1), create_ball(2, 0.2)]
+    balls.append({**create_ball(3, 0.3), "id": None})
+    _, cursor = detect_ball_events(123, balls, 1)
+    assert cursor == 2
+    _, cursor = detect_ball_events(123, [{**create_ball(4, 0.4), "id": None}], 2)
+    assert cursor == 2
+
+def test_event_id_is_deterministic():
+    """Test that re-deriving the same ball gives the same event ID."""
+    balls = [create_ball(1, 0.1), create_ball(2, 0.2, runs=6, six=True)]
+    first, _ = detect_ball_events(123, balls, 1)
+    again, _ = detect_ball_events(123, balls, 1)
+    assert first[0].event_id == again[0].event_id == "123:1:b2:SIX"
+    assert first[0].model_dump()["event_id"] == "123:1:b2:SIX"
@@ -0,0 +1,146 @@
+import json
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from app.api.routes import matches
+from app.core import metrics
+from app.infrastructure import compressed_store
+from app.infrastructure.tiered_cache import LocalLRU
+from app.main import app
+from app.services.score_service import LIVESCORE_BOARD_KEY, LIVESCORE_BOARD_ETAG_KEY
+from app.core.http_cache import HTTPCacheMiddleware, make_etag, etag_matches, cache_policy
+from app.core.compression import negotiate_encoding, encoded_etag, BROTLI_AVAILABLE
+
+def test_etag_is_stable_and_content_based():
+    """Test that the ETag depends only on the body content."""
+    assert make_etag('{"a":1}') == make_etag(b'{"a":1}')
+    assert make_etag('{"a":1}') != make_etag('{"a":2}')
+
+def test_etag_matches_lists_weak_tags_and_wildcard():
+    """Test If-None-Match lists, weak tags and '*'."""
+    etag = make_etag("body")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+def test_cache_policy_covers_read_routes_only():
+    """Test that streams and write routes get no Cache-Control policy."""
+    assert "max-age" in cache_policy("/api/v1/matches/livescore")
+    assert "max-age" in cache_policy("/api/v1/matches/123")
+    assert cache_policy("/api/v1/matches/123/live") != cache_policy("/api/v1/matches/123")
+    assert cache_policy("/api/v1/matches/123/stream") is None
+    assert cache_policy("/api/v1/matches/123/events") is None
+    assert cache_policy("/api/v1/waitlist/") is None
+
+def test_negotiate_encoding_respects_q_values():
+    """Test that encodings refused with q=0 are never chosen."""
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("br, gzip;q=0.5") == ("br" if BROTLI_AVAILABLE else "gzip")
+
+def test_encoded_etag_is_distinct_per_encoding():
+    """Test that each compressed representation gets its own ETag."""
+    etag = make_etag("body")
+    assert encoded_etag(etag, "gzip") != etag
+    assert encoded_etag(etag, "gzip").endswith('-gzip"')
+
+@pytest.fixture
+def redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(matches, "async_redis_client", fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(compressed_store, "async_redis_binary_client", fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(compressed_store, "_local_variants", LocalLRU(max_entries=100, ttl=60))
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+@pytest.fixture
+def client():
+    return TestClient(app, headers={"Accept-Encoding": "identity"})
+
+def store_board(redis, cards: int = 1) -> str:
+    """Helper to store a livescore board of 'cards' entries; returns its ETag."""
+    board = json.dumps([{"match_id": i, "status": "NS"} for i in range(cards)])
+    etag = make_etag(board)
+    redis.mset({LIVESCORE_BOARD_KEY: board, LIVESCORE_BOARD_ETAG_KEY: etag})
+    return etag
+
+def test_middleware_keeps_route_etag_and_adds_cache_control(redis, client):
+    """Test that a route-set ETag is kept and the route's Cache-Control is added."""
+    etag = store_board(redis)
+    response = client.get("/api/v1/matches/livescore")
+    assert response.status_code == 200
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == cache_policy("/api/v1/matches/livescore")
+
+def test_middleware_answers_if_none_match_with_bare_304(redis, client):
+    """Test that a matching If-None-Match gets a 304 with only the validator headers."""
+    etag = store_board(redis)
+    response = client.get("/api/v1/matches/livescore", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert set(response.headers) <= {"etag", "cache-control", "vary"}
+
+def test_middleware_adds_cache_control_to_route_level_304(redis, client):
+    """Test that a since_version 304 from the route still carries Cache-Control."""
+    redis.set("live:version", 3)
+    response = client.get("/api/v1/matches/live", params={"since_version": 3})
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == cache_policy("/api/v1/matches/live")
+
+def test_middleware_passes_errors_through(client):
+    """Test that non-200 responses get no ETag and no Cache-Control."""
+    response = client.get("/api/v1/matches/not-a-number/live")
+    assert response.status_code == 422
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
+
+def test_middleware_passes_event_streams_through():
+    """Test that an event stream on a cached path is neither buffered nor tagged."""
+    async def stream(request):
+        async def frames():
+            yield "event: snapshot\ndata: {}\n\n"
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    sse_app = HTTPCacheMiddleware(Starlette(routes=[Route("/api/v1/matches/live", stream)]))
+    response = TestClient(sse_app).get("/api/v1/matches/live")
+    assert response.status_code == 200
+    assert response.text == "event: snapshot\ndata: {}\n\n"
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
+
+def test_large_response_is_served_gzip_with_its_own_etag(redis):
+    """Test that a large body is compressed with a per-encoding ETag and Vary."""
+    etag = store_board(redis, cards=50)
+    response = TestClient(app).get("/api/v1/matches/livescore", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == encoded_etag(etag, "gzip")
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 50
+
+def test_encoded_etag_revalidates_to_304(redis):
+    """Test that If-None-Match with the gzip ETag is answered with 304."""
+    etag = store_board(redis, cards=50)
+    response = TestClient(app).get(
+        "/api/v1/matches/livescore",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": encoded_etag(etag, "gzip")}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_repeat_hit_reuses_the_stored_variant(redis):
+    """Test that a body is compressed once and later hits reuse the stored variant."""
+    store_board(redis, cards=50)
+    client = TestClient(app, headers={"Accept-Encoding": "gzip"})
+    before = {name: metrics.get(name) for name in ("compression.compressed", "compression.local_hit")}
+    first = client.get("/api/v1/matches/livescore")
+    second = client.get("/api/v1/matches/livescore")
+    assert first.content == second.content
+    assert metrics.get("compression.compressed") - before["compression.compressed"] == 1
+    assert metrics.get("compression.local_hit") - before["compression.local_hit"] == 1
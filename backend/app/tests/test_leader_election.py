@@ -0,0 +1,28 @@
+import asyncio
+import time
+from app.infrastructure.leader_election import LeaderElection
+
+def test_leader_steps_down_when_redis_is_unreachable():
+    """Test that failed heartbeats do not extend the lease past its TTL."""
+    election = LeaderElection(key="test:leader", ttl=0.3)
+
+    async def renew_ok(keys, args):
+        return 1
+
+    async def renew_down(keys, args):
+        raise ConnectionError("redis down")
+
+    async def run():
+        election._elected.set()
+        election._renew = renew_ok
+        assert await election.heartbeat()
+
+        election._renew = renew_down
+        assert await election.heartbeat()  # still inside the lease
+        deadline = time.monotonic() + 0.6
+        while time.monotonic() < deadline and election.is_leader:
+            await election.heartbeat()
+            await asyncio.sleep(0.05)
+        return election.is_leader
+
+    assert asyncio.run(run()) is False
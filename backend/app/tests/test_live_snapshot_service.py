@@ -0,0 +1,224 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from types import SimpleNamespace
+import fakeredis
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.domain.models import LiveMatch, MatchEvent
+from app.domain.models.event import EventType
+from app.infrastructure import async_redis_client as redis_helpers
+from app.infrastructure.async_redis_client import APPEND_EVENT_ONCE_LUA, append_event, read_events
+from app.services import live_snapshot_service
+from app.services.live_snapshot_service import (
+    MatchPollResult, PreviousState, PROCESSED, SKIPPED, FAILED,
+    write_cycle, process_live_match, poll_and_store_live_matches, sync_match_statuses
+)
+from app.services.poll_scheduler import PollScheduler
+from app.core.config import settings
+from app.services.live_stream_service import LIVE_UPDATES_CHANNEL
+
+@pytest.fixture
+def redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    binary = fakeredis.FakeAsyncRedis(server=server, decode_responses=False)
+    monkeypatch.setattr(redis_helpers, "async_redis_client", redis)
+    monkeypatch.setattr(redis_helpers, "_append_event_once", redis.register_script(APPEND_EVENT_ONCE_LUA))
+    monkeypatch.setattr(live_snapshot_service, "async_redis_client", redis)
+    monkeypatch.setattr(live_snapshot_service, "async_redis_binary_client", binary)
+    return redis
+
+def upstream_list(monkeypatch, *match_ids):
+    """Helper to make the upstream livescores list return these match ids."""
+    async def get_raw_live_matches():
+        return {"data": [{"id": mid} for mid in match_ids]}
+    monkeypatch.setattr(live_snapshot_service, "get_raw_live_matches", get_raw_live_matches)
+
+def four(match_id, ball_id):
+    """Helper to create a ball-by-ball boundary event."""
+    return MatchEvent(
+        match_id=match_id, event_type=EventType.FOUR, description="FOUR runs!",
+        inning=1, over=0.2, ball_id=ball_id
+    )
+
+def processed(match_id, events):
+    """Helper to create a processed poll result."""
+    match = LiveMatch(match_id=match_id, status="1st Innings", last_updated=datetime.now())
+    return MatchPollResult(PROCESSED, match, events, fingerprint=f"fp{match_id}", last_ball_id=2)
+
+def test_append_event_once_dedupes_on_event_id(redis):
+    """Test that the same event_id is only ever appended once."""
+    async def run():
+        first = await append_event("match:stream:1", {"n": 1}, "1:1:b2:FOUR")
+        again = await append_event("match:stream:1", {"n": 1}, "1:1:b2:FOUR")
+        return first, again, await read_events("match:stream:1")
+
+    first, again, events = asyncio.run(run())
+    assert first is not None and again is None
+    assert [e["id"] for e in events] == [first]
+
+def test_write_cycle_publishes_events_with_their_own_entry_ids(redis):
+    """Test that pipeline results map back to the right events when some are duplicates."""
+    duplicate, fresh, other = four(1, 2), four(1, 3), four(2, 7)
+
+    async def run():
+        await append_event("match:stream:1", duplicate.model_dump(mode="json"), duplicate.event_id)
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(LIVE_UPDATES_CHANNEL)
+        await pubsub.get_message(timeout=1)  # subscribe confirmation
+
+        await write_cycle([processed(1, [duplicate, fresh]), processed(2, [other])], ["1", "2"], version=5)
+
+        updates = []
+        while (message := await pubsub.get_message(timeout=0.2)) is not None:
+            updates.append(json.loads(message["data"]))
+        streams = {mid: await read_events(f"match:stream:{mid}") for mid in ("1", "2")}
+        snapshot = await redis.get("live:match:1")
+        return updates, streams, json.loads(snapshot)
+
+    updates, streams, snapshot = asyncio.run(run())
+    published = {u["data"]["event_id"]: u["data"]["id"] for u in updates if u["type"] == "event"}
+    assert duplicate.event_id not in published
+    assert published[fresh.event_id] == streams["1"][-1]["id"]
+    assert published[other.event_id] == streams["2"][-1]["id"]
+    assert {u["match_id"] for u in updates if u["type"] == "snapshot"} == {"1", "2"}
+    assert snapshot["version"] == 5
+
+def test_failed_board_rebuild_waits_for_the_refresh_interval(redis, monkeypatch):
+    """Test that a failing board rebuild does not make the poller spin at the minimum sleep."""
+    upstream_list(monkeypatch)
+    attempts = []
+    async def failing_rebuild():
+        attempts.append(1)
+        raise ConnectionError("postgres down")
+    monkeypatch.setattr(live_snapshot_service, "rebuild_live_scores_board", failing_rebuild)
+    scheduler = PollScheduler()
+
+    async def run():
+        first = await poll_and_store_live_matches(scheduler)
+        second = await poll_and_store_live_matches(scheduler)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(attempts) == 1
+    assert first > settings.LIVE_POLL_MIN_SLEEP and second > settings.LIVE_POLL_MIN_SLEEP
+
+def test_empty_live_list_clears_the_index(redis, monkeypatch):
+    """Test that an empty livescores list drops the old index and bumps the version only once."""
+    upstream_list(monkeypatch)
+    async def rebuild():
+        return None
+    monkeypatch.setattr(live_snapshot_service, "rebuild_live_scores_board", rebuild)
+
+    async def run():
+        await redis.set("live:matches", "5", ex=60)
+        await redis.set("live:version", 3)
+        await poll_and_store_live_matches(PollScheduler())
+        await poll_and_store_live_matches(PollScheduler())
+        return await redis.mget(["live:matches", "live:version", "live:all"])
+
+    index, version, document = asyncio.run(run())
+    assert index is None
+    assert version == "4"
+    assert json.loads(document) == {"version": 4, "data": []}
+
+def test_unchanged_match_still_records_its_poll_time(redis):
+    """Test that a skipped (unchanged) match gets a fresh polled-at time."""
+    async def run():
+        await write_cycle([MatchPollResult(SKIPPED)], ["1"], polled_ids=["1"])
+        return await redis.get("live:polled_at:1")
+
+    polled_at = asyncio.run(run())
+    assert abs(float(polled_at) - time.time()) < 5
+
+def test_poll_fans_out_within_concurrency_limit_and_skips_hung_match(redis, monkeypatch):
+    """Test that cycle time tracks the slowest match, concurrency is capped and a hung match fails alone."""
+    monkeypatch.setattr(settings, "LIVE_POLL_CONCURRENCY", 3)
+    monkeypatch.setattr(settings, "LIVE_POLL_MATCH_TIMEOUT", 0.3)
+    upstream_list(monkeypatch, 1, 2, 3, 4)
+    in_flight, peak = [0], [0]
+
+    async def get_raw_live_match(match_id, priority=None):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        try:
+            await asyncio.sleep(60 if match_id == "4" else 0.2)
+        finally:
+            in_flight[0] -= 1
+        return {"data": {
+            "id": int(match_id), "status": "1st Innings", "type": "T20",
+            "runs": [{"inning": 1, "team_id": 1, "score": 10, "wickets": 0, "overs": 1.1}]
+        }}
+
+    async def noop(*args, **kwargs):
+        return 0
+    monkeypatch.setattr(live_snapshot_service, "get_raw_live_match", get_raw_live_match)
+    monkeypatch.setattr(live_snapshot_service, "sync_match_statuses", noop)
+    monkeypatch.setattr(live_snapshot_service, "rebuild_live_scores_board", noop)
+
+    async def run():
+        started = time.monotonic()
+        await poll_and_store_live_matches(PollScheduler())
+        elapsed = time.monotonic() - started
+        return elapsed, await redis.exists(*[f"live:match:{mid}" for mid in (1, 2, 3)]), await redis.exists("live:match:4")
+
+    elapsed, written, hung_written = asyncio.run(run())
+    assert elapsed < 0.8  # sequential would take 3 * 0.2 + 0.3
+    assert peak[0] == 3
+    assert written == 3 and hung_written == 0
+
+def test_timed_out_match_comes_back_failed(monkeypatch):
+    """Test that a match whose fetch exceeds the timeout is reported FAILED."""
+    monkeypatch.setattr(settings, "LIVE_POLL_MATCH_TIMEOUT", 0.05)
+
+    async def hung(match_id, priority=None):
+        await asyncio.sleep(60)
+    monkeypatch.setattr(live_snapshot_service, "get_raw_live_match", hung)
+
+    result = asyncio.run(process_live_match("4", asyncio.Semaphore(1), PreviousState()))
+    assert result.outcome == FAILED
+
+class FakeStatusSession:
+    """Stand-in AsyncSession: answers the status SELECT and records what runs after it."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        rows = self.rows
+        class Result:
+            def all(self):
+                return rows
+        return Result()
+
+    async def commit(self):
+        self.commits += 1
+
+def test_status_sync_updates_only_changed_rows_in_one_statement():
+    """Test that changed statuses go into a single UPDATE ... CASE and unchanged rows are left out."""
+    db = FakeStatusSession([SimpleNamespace(match_id="1", status="NS"), SimpleNamespace(match_id="2", status="1st Innings")])
+    live = [
+        LiveMatch(match_id=1, status="1st Innings", last_updated=datetime.now()),
+        LiveMatch(match_id=2, status="1st Innings", last_updated=datetime.now()),
+    ]
+
+    changed = asyncio.run(sync_match_statuses(db, live))
+    assert changed == 1 and db.commits == 1
+    select_stmt, update_stmt = db.statements
+    compiled = update_stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    sql = str(compiled)
+    assert sql.startswith("UPDATE matches SET status=CASE")
+    assert "'1'" in sql and "'2'" not in sql
+
+def test_status_sync_commits_nothing_when_nothing_changed():
+    """Test that an all-unchanged cycle issues no UPDATE and no commit."""
+    db = FakeStatusSession([SimpleNamespace(match_id="1", status="1st Innings")])
+    live = [LiveMatch(match_id=1, status="1st Innings", last_updated=datetime.now())]
+
+    assert asyncio.run(sync_match_statuses(db, live)) == 0
+    assert len(db.statements) == 1 and db.commits == 0
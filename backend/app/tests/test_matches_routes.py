@@ -0,0 +1,89 @@
+import json
+import time
+from datetime import datetime, timedelta
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+from app.api.routes import matches
+from app.infrastructure import async_redis_client as redis_helpers
+from app.infrastructure import tiered_cache as tiered_cache_module
+from app.infrastructure.tiered_cache import LocalLRU, tiered_cache
+from app.main import app
+
+@pytest.fixture
+def redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    async_redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(matches, "async_redis_client", async_redis)
+    monkeypatch.setattr(redis_helpers, "async_redis_client", async_redis)
+    monkeypatch.setattr(tiered_cache_module, "async_redis_client", async_redis)
+    monkeypatch.setattr(tiered_cache, "local", LocalLRU(max_entries=100, ttl=60))
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+@pytest.fixture
+def client():
+    return TestClient(app, headers={"Accept-Encoding": "identity"})
+
+def store_snapshot(redis, match_id=1, version=3, **fields):
+    """Helper to store a poller snapshot for a live match."""
+    snapshot = {"match_id": match_id, "status": "1st Innings", "version": version,
+                "last_updated": datetime.now().isoformat(), **fields}
+    redis.set(f"live:match:{match_id}", json.dumps(snapshot))
+    return snapshot
+
+def test_snapshot_age_counts_from_last_poll(redis, client):
+    """Test that an unchanged match reports its age from the last poll, not its last change."""
+    store_snapshot(redis, last_updated=(datetime.now() - timedelta(minutes=20)).isoformat())
+    redis.set("live:polled_at:1", time.time() - 10)
+    response = client.get("/api/v1/matches/1/live")
+    assert response.status_code == 200
+    assert 9 <= int(response.headers["x-snapshot-age"]) <= 11
+
+def store_live_index(redis, version, match_ids):
+    """Helper to store the live version, index and aggregated document."""
+    redis.set("live:version", version)
+    redis.set("live:matches", ",".join(str(mid) for mid in match_ids))
+    redis.set("live:all", json.dumps({"version": version, "data": []}))
+    redis.set("live:all:etag", '"doc"')
+
+def test_live_list_304_when_client_is_current(redis, client):
+    """Test that /live answers 304 when since_version equals the server's version."""
+    store_live_index(redis, 3, [1])
+    assert client.get("/api/v1/matches/live", params={"since_version": 3}).status_code == 304
+
+def test_live_list_delta_since_older_version(redis, client):
+    """Test that /live returns only the matches that changed after since_version."""
+    store_live_index(redis, 3, [1, 2])
+    store_snapshot(redis, match_id=1, version=3)
+    store_snapshot(redis, match_id=2, version=1)
+    body = client.get("/api/v1/matches/live", params={"since_version": 2}).json()
+    assert body["base_version"] == 2 and body["match_ids"] == ["1", "2"]
+    assert [m["match_id"] for m in body["data"]] == [1]
+
+def test_live_list_full_document_when_client_is_ahead(redis, client):
+    """Test that a since_version ahead of the server (e.g. after a Redis flush) gets the full document."""
+    store_live_index(redis, 3, [1])
+    response = client.get("/api/v1/matches/live", params={"since_version": 9})
+    assert response.status_code == 200
+    assert response.json() == {"version": 3, "data": []}
+
+def test_live_match_304_when_client_is_current(redis, client):
+    """Test that /{id}/live answers 304 when since_version equals the snapshot's version."""
+    store_snapshot(redis, version=3)
+    assert client.get("/api/v1/matches/1/live", params={"since_version": 3}).status_code == 304
+
+def test_live_match_delta_from_history(redis, client):
+    """Test that /{id}/live returns only the changed fields when the base version is in history."""
+    base = store_snapshot(redis, version=2, note="")
+    store_snapshot(redis, version=3, note="Rain delay")
+    redis.lpush("live:history:1", json.dumps(base))
+    body = client.get("/api/v1/matches/1/live", params={"since_version": 2}).json()
+    assert body["base_version"] == 2 and body["version"] == 3
+    assert body["changes"]["note"] == "Rain delay"
+
+def test_live_match_full_snapshot_when_client_is_ahead(redis, client):
+    """Test that a since_version ahead of the snapshot gets the full snapshot, not a 304."""
+    snapshot = store_snapshot(redis, version=3)
+    response = client.get("/api/v1/matches/1/live", params={"since_version": 9})
+    assert response.status_code == 200
+    assert response.json()["version"] == 3 and response.json()["status"] == snapshot["status"]
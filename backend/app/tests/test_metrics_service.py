@@ -0,0 +1,30 @@
+import asyncio
+import fakeredis
+import pytest
+from app.core import metrics
+from app.infrastructure import upstream_guard
+from app.services import metrics_service
+from app.services.metrics_service import publish_worker_metrics, read_worker_metrics
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(metrics_service, "async_redis_client", redis)
+    monkeypatch.setattr(upstream_guard, "async_redis_client", redis)
+    return redis
+
+def test_worker_metrics_reach_the_api(redis):
+    """Test that a worker's counters and breaker states are readable from another process."""
+    metrics.incr("live_snapshots.processed")
+
+    async def run():
+        await publish_worker_metrics("worker-1", is_leader=True)
+        return await read_worker_metrics(), await redis.ttl("metrics:worker:worker-1")
+
+    workers, ttl = asyncio.run(run())
+    worker = workers["worker-1"]
+    assert worker["is_leader"] is True
+    assert worker["counters"]["live_snapshots.processed"] >= 1
+    assert worker["upstreams"]["sportmonks"]["circuit"] == "closed"
+    assert "sportmonks" in worker["http"]
+    assert ttl > 0
@@ -0,0 +1,71 @@
+from datetime import datetime
+from app.core.config import settings
+from app.domain.models.live import LiveMatch, InningScore
+from app.services.poll_scheduler import PollScheduler, poll_interval
+
+def create_live_match(status, innings_data, match_type="T20"):
+    """Helper to create a LiveMatch with specific innings."""
+    return LiveMatch(
+        match_id=123,
+        status=status,
+        match_type=match_type,
+        innings=[InningScore(**i) for i in innings_data],
+        last_updated=datetime.now()
+    )
+
+def test_poll_interval_innings_break_is_slow():
+    """Test that an innings break is polled at the slow interval."""
+    match = create_live_match("Innings Break", [
+        {"inning": 1, "team_id": 10, "score": 160, "wickets": 6, "overs": 20.0}
+    ])
+    assert poll_interval(match) == settings.LIVE_POLL_BREAK_INTERVAL
+
+def test_poll_interval_death_overs_is_fast():
+    """Test that the last overs of a chase are polled at the fast interval."""
+    match = create_live_match("2nd Innings", [
+        {"inning": 1, "team_id": 10, "score": 160, "wickets": 6, "overs": 20.0},
+        {"inning": 2, "team_id": 20, "score": 140, "wickets": 4, "overs": 18.2}
+    ])
+    assert poll_interval(match) == settings.LIVE_POLL_DEATH_INTERVAL
+
+def test_poll_interval_middle_overs_uses_default():
+    """Test that middle overs use the default interval."""
+    match = create_live_match("1st Innings", [
+        {"inning": 1, "team_id": 10, "score": 80, "wickets": 2, "overs": 10.0}
+    ])
+    assert poll_interval(match) == settings.LIVE_POLL_INTERVAL
+
+def test_poll_interval_test_match_has_no_death_phase():
+    """Test that a Test match never switches to the death-overs interval."""
+    match = create_live_match("1st Innings", [
+        {"inning": 1, "team_id": 10, "score": 300, "wickets": 3, "overs": 85.0}
+    ], match_type="Test")
+    assert poll_interval(match) == settings.LIVE_POLL_INTERVAL
+
+def test_scheduler_only_returns_due_matches():
+    """Test that only matches whose next poll time has passed are returned."""
+    scheduler = PollScheduler()
+    scheduler.set_live_ids(["1", "2"], now=0)
+    scheduler.board_rebuilt(now=0)
+    assert scheduler.due_matches(now=0) == ["1", "2"]
+
+    scheduler.schedule("1", 10, now=0)
+    scheduler.schedule("2", 120, now=0)
+    assert scheduler.due_matches(now=15) == ["1"]
+    assert scheduler.seconds_until_next(now=0) == 10
+
+def test_scheduler_rebuilds_board_periodically():
+    """Test that the livescore board is due again after its refresh interval."""
+    scheduler = PollScheduler()
+    assert scheduler.board_due(now=0)
+    scheduler.board_rebuilt(now=0)
+    assert not scheduler.board_due(now=1)
+    assert scheduler.board_due(now=settings.LIVESCORE_BOARD_REFRESH_INTERVAL)
+
+def test_scheduler_forgets_matches_that_left_the_list():
+    """Test that matches no longer live are dropped from the schedule."""
+    scheduler = PollScheduler()
+    scheduler.set_live_ids(["1", "2"], now=0)
+    scheduler.schedule("2", 30, now=0)
+    scheduler.set_live_ids(["1"], now=5)
+    assert not scheduler.has_polled("2")
@@ -0,0 +1,20 @@
+from decimal import Decimal
+from app.core import serialization
+from app.infrastructure.tiered_cache import _split_swr_entry, SWR_PREFIX, SWR_VALUE_MARKER
+
+def test_dumps_round_trips_and_stringifies_unknown_types():
+    """Test that dumps/loads round-trip and unknown types become strings."""
+    data = serialization.dumps({"id": 1, "odds": Decimal("1.5"), "tags": ["a"]})
+    assert serialization.loads(data) == {"id": 1, "odds": "1.5", "tags": ["a"]}
+
+def test_swr_entry_value_is_sliced_without_parsing():
+    """Test that the value's JSON text is cut out of an SWR entry as is."""
+    entry = f'{SWR_PREFIX}123.5{SWR_VALUE_MARKER}{{"value":[1,2]}}}}'
+    data, fresh_until = _split_swr_entry(entry.encode())
+    assert fresh_until == 123.5
+    assert serialization.loads(data) == {"value": [1, 2]}
+
+def test_swr_entry_in_old_format_is_not_split():
+    """Test that a plain document cached by an older release reads as a miss, not an error."""
+    assert _split_swr_entry(b'{"id": 1, "status": "NS"}') is None
+    assert _split_swr_entry('{"fresh_until":"x","value":{}}') is None
@@ -0,0 +1,133 @@
+import asyncio
+import fakeredis
+import pytest
+from app.core.config import settings
+from app.infrastructure import single_flight
+from app.infrastructure.leader_election import RELEASE_LEASE_LUA
+from app.infrastructure.single_flight import SingleFlight
+
+@pytest.fixture
+def flight(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(single_flight, "async_redis_client", redis)
+    monkeypatch.setattr(settings, "SINGLE_FLIGHT_WAIT", 1.0)
+    flight = SingleFlight("test")
+    flight._release = redis.register_script(RELEASE_LEASE_LUA)
+    return flight, redis
+
+def counting_loader(value="fresh"):
+    calls = []
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return value
+    return loader, calls
+
+async def empty_cache():
+    return None
+
+def test_concurrent_callers_share_one_load(flight):
+    """Test that concurrent callers in one process trigger a single load."""
+    flight, redis = flight
+    loader, calls = counting_loader()
+
+    async def run():
+        return await asyncio.gather(*[flight.do("k", loader, empty_cache) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["fresh"] * 5
+    assert len(calls) == 1
+
+def test_lock_is_released_after_load(flight):
+    """Test that the cross-process lock is dropped once the loader finishes."""
+    flight, redis = flight
+    loader, _ = counting_loader()
+
+    async def run():
+        await flight.do("k", loader, empty_cache)
+        return await redis.exists("lock:test:k")
+
+    assert asyncio.run(run()) == 0
+
+def test_lock_held_elsewhere_returns_stale_value(flight):
+    """Test that a caller with a stale value does not wait for another process's refresh."""
+    flight, redis = flight
+    loader, calls = counting_loader()
+
+    async def run():
+        await redis.set("lock:test:k", "other-process", px=10000)
+        return await flight.do("k", loader, empty_cache, stale="stale")
+
+    assert asyncio.run(run()) == "stale"
+    assert calls == []
+
+def test_lock_held_elsewhere_waits_for_cache(flight):
+    """Test that a caller without a stale value waits for the other process to fill the cache."""
+    flight, redis = flight
+    loader, calls = counting_loader()
+    cache = {}
+
+    async def read_cache():
+        return cache.get("k")
+
+    async def other_process():
+        await asyncio.sleep(0.1)
+        cache["k"] = "from-other-process"
+
+    async def run():
+        await redis.set("lock:test:k", "other-process", px=10000)
+        filler = asyncio.create_task(other_process())
+        result = await flight.do("k", loader, read_cache)
+        await filler
+        return result
+
+    assert asyncio.run(run()) == "from-other-process"
+    assert calls == []
+
+def test_lock_dropped_without_cache_falls_back_to_load(flight):
+    """Test that a caller loads itself if the other process gives up without filling the cache."""
+    flight, redis = flight
+    loader, calls = counting_loader()
+
+    async def other_process_gives_up():
+        await asyncio.sleep(0.1)
+        await redis.delete("lock:test:k")
+
+    async def run():
+        await redis.set("lock:test:k", "other-process", px=10000)
+        giver = asyncio.create_task(other_process_gives_up())
+        result = await flight.do("k", loader, empty_cache)
+        await giver
+        return result
+
+    assert asyncio.run(run()) == "fresh"
+    assert len(calls) == 1
+
+def test_waiters_take_the_lock_in_turn_when_holder_gives_up(flight):
+    """Test that waiters in several processes retry the lock instead of all loading at once."""
+    first, redis = flight
+    second = SingleFlight("test")
+    second._release = first._release
+    cache, calls = {}, []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        cache["k"] = "fresh"
+        return "fresh"
+
+    async def read_cache():
+        return cache.get("k")
+
+    async def holder_gives_up():
+        await asyncio.sleep(0.1)
+        await redis.delete("lock:test:k")
+
+    async def run():
+        await redis.set("lock:test:k", "other-process", px=10000)
+        giver = asyncio.create_task(holder_gives_up())
+        results = await asyncio.gather(first.do("k", loader, read_cache), second.do("k", loader, read_cache))
+        await giver
+        return results
+
+    assert asyncio.run(run()) == ["fresh", "fresh"]
+    assert len(calls) == 1
@@ -0,0 +1,27 @@
+from app.infrastructure.tiered_cache import LocalLRU
+
+def test_local_lru_evicts_least_recently_used():
+    """Test that the local tier evicts the least recently used entry."""
+    lru = LocalLRU(max_entries=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")  # 'b' is now the oldest
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1 and lru.get("c") == 3
+
+def test_local_lru_expires_entries():
+    """Test that local entries expire after their TTL."""
+    lru = LocalLRU(max_entries=10, ttl=60)
+    lru.set("a", 1, ttl=0)
+    assert lru.get("a") is None
+
+def test_local_lru_drops_by_tag():
+    """Test that dropping a tag removes only the entries carrying it."""
+    lru = LocalLRU(max_entries=10, ttl=60)
+    lru.set("match:detail:1", {}, tags=["match:1"])
+    lru.set("live:match:1", {}, tags=["match:1"])
+    lru.set("engagement:feed:all:20", {}, tags=["feed"])
+    lru.drop_tags(["match:1"])
+    assert len(lru) == 1
+    assert lru.get("engagement:feed:all:20") == {}
@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from app.infrastructure.upstream_guard import CircuitBreaker, UpstreamGuard, Priority
+
+def test_breaker_opens_after_threshold():
+    """Test that the breaker opens after N consecutive failures."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+def test_breaker_half_open_allows_single_trial():
+    """Test that a half-open breaker lets exactly one trial request through."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # second caller waits for the trial's outcome
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+def test_breaker_success_resets_failure_count():
+    """Test that a success resets the consecutive failure count."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+def test_cancelled_trial_frees_half_open_breaker():
+    """Test that a trial call cancelled by a timeout does not block the upstream forever."""
+    guard = UpstreamGuard()
+    breaker = guard.breakers["sportmonks"]
+    breaker.reset_timeout = 0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    async def allow_token(upstream, priority):
+        return True
+    guard._acquire_token = allow_token
+
+    async def slow_call():
+        async with guard.call("sportmonks", Priority.LIVE):
+            await asyncio.sleep(1)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(slow_call(), 0.01)
+
+    asyncio.run(run())
+    assert breaker.state == "half_open"
+    assert breaker.allow()
@@ -0,0 +1,128 @@
+"""
+Background ingestion worker.
+
+Runs the live, Twitter, YouTube, news and schedule-sync loops. The API
+process starts them on startup unless RUN_BACKGROUND_TASKS=false; to scale
+ingestion separately, run them in their own process instead:
+
+    python -m app.worker
+"""
+from app.services.live_snapshot_service import poll_and_store_live_matches
+from app.infrastructure.db import SessionLocal
+from app.services.schedule_service import sync_schedules_to_db
+from app.services.engagement_service import fetch_and_store_engagement
+from app.services.news_service import fetch_and_store_news
+from app.infrastructure.http_client import start_http_clients, close_http_clients
+from app.infrastructure.async_redis_client import close_redis
+from app.infrastructure.leader_election import leader_election
+from app.services.metrics_service import start_metrics_publishing
+from app.core.config import settings
+from app.core import logging as _logging_config
+import asyncio
+import logging
+import signal
+
+logger = logging.getLogger(__name__)
+
+#Live Poller (Background)
+async def start_live_polling():
+    while True:
+        await leader_election.wait_until_leader()
+        # Each match has its own next-poll time; sleep until the earliest one
+        delay = settings.LIVE_POLL_INTERVAL
+        try:
+            delay = await poll_and_store_live_matches()
+        except Exception as e:
+            logger.error(f"Live polling error: {e}")
+        await asyncio.sleep(delay)
+
+#Twitter Poller (every 90 mins)
+async def start_twitter_polling():
+    while True:
+        await leader_election.wait_until_leader()
+        try:
+            logger.info("Scheduled Task: Fetching Tweets...")
+            with SessionLocal() as db:
+                await fetch_and_store_engagement(db, "twitter")
+        except Exception as e:
+            logger.error(f"Twitter polling error: {e}")
+        await asyncio.sleep(5400) # 90 minutes * 60s
+
+#YouTube Poller (Every 20 mins)
+async def start_youtube_polling():
+    while True:
+        await leader_election.wait_until_leader()
+        try:
+            logger.info("Scheduled Task: Fetching Videos...")
+            with SessionLocal() as db:
+                await fetch_and_store_engagement(db, "youtube")
+        except Exception as e:
+            logger.error(f"YouTube polling error: {e}")
+        await asyncio.sleep(1200) # 20 minutes * 60s
+
+#Schedule Sync (Background - NON-BLOCKING)
+async def run_initial_sync():
+    await leader_election.wait_until_leader()
+    logger.info("Starting background schedule sync...")
+    db = SessionLocal()
+    try:
+        await sync_schedules_to_db(db)
+        logger.info("Schedule sync completed successfully.")
+    except Exception as e:
+        logger.error(f"Startup schedule sync failed: {e}")
+    finally:
+        db.close()
+
+#News Polling(every 4 hours)
+async def start_news_polling():
+    while True:
+        await leader_election.wait_until_leader()
+        try:
+            logger.info("Scheduled Task: Fetching News...")
+            with SessionLocal() as db:
+                await fetch_and_store_news(db)
+        except Exception as e:
+            logger.error(f"News polling error: {e}")
+
+        # Sleep for 4 hours (14400 seconds)
+        await asyncio.sleep(14400)
+
+def start_background_tasks() -> list[asyncio.Task]:
+    """
+    Schedules every ingestion loop on the running event loop and returns the tasks.
+    Every process joins the election; only the leader's loops get past wait_until_leader().
+    """
+    return [
+        asyncio.create_task(leader_election.run()),
+        asyncio.create_task(start_live_polling()),
+        asyncio.create_task(start_twitter_polling()),
+        asyncio.create_task(start_youtube_polling()),
+        asyncio.create_task(start_news_polling()),
+        asyncio.create_task(run_initial_sync()),
+    ]
+
+async def main():
+    start_http_clients()
+    tasks = start_background_tasks()
+    # No HTTP server here: the API's /metrics shows this worker's counters from Redis
+    tasks.append(asyncio.create_task(
+        start_metrics_publishing(leader_election.worker_id, lambda: leader_election.is_leader)
+    ))
+    logger.info("Ingestion worker started.")
+
+    # Containers stop us with SIGTERM; cancel the loops so cleanup below runs
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: [t.cancel() for t in tasks])
+
+    try:
+        await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        logger.info("Ingestion worker shutting down...")
+    finally:
+        await leader_election.release()
+        await close_http_clients()
+        await close_redis()
+
+if __name__ == "__main__":
+    asyncio.run(main())